@@ -0,0 +1 @@
+# Benchmarks package for email filtering ML project
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Bytes Parsing Benchmark
+
+Compares decoding raw messages to str for parse_email_content with the
+bytes-native parse_email_bytes (from bytes and from memoryviews), reporting
+throughput and peak memory per message.
+
+Run from the project root:
+    python -m benchmarks.bench_bytes
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.bench_parser import build_message
+from src.utils.email_parser import EmailParser
+
+
+def measure(func, messages):
+    """Return (messages/second, peak traced MB for the first message)."""
+    tracemalloc.start()
+    func(messages[0])
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for raw in messages:
+        func(raw)
+    elapsed = time.perf_counter() - start
+    return len(messages) / elapsed, peak
+
+
+def main():
+    parser_args = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser_args.add_argument('--messages', type=int, default=30)
+    parser_args.add_argument('--attachments', type=int, default=100,
+                             help="16 KB attachments per message")
+    args = parser_args.parse_args()
+
+    messages = [build_message(i, args.attachments).encode('utf-8') for i in range(args.messages)]
+    parser = EmailParser()
+    size_mb = len(messages[0]) / 1e6
+
+    cases = [
+        ("decode + parse_email_content", lambda raw: parser.parse_email_content(raw.decode('utf-8'))),
+        ("parse_email_bytes(bytes)", parser.parse_email_bytes),
+        ("parse_email_bytes(memoryview)", lambda raw: parser.parse_email_bytes(memoryview(raw))),
+    ]
+
+    print("📊 Bytes parsing benchmark")
+    print(f"   - Messages: {len(messages)} (~{size_mb:.1f} MB each)")
+    for name, func in cases:
+        rate, peak = measure(func, messages)
+        print(f"   - {name}: {rate:,.1f} messages/second, peak {peak:,.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
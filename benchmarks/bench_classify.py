@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Classification Latency Benchmark
+
+Trains a small model on synthetic messages, then measures the cold-start
+and warm per-message latency of models.classify.classify and checks the
+p50/p99 targets.
+
+Run from the project root:
+    python -m benchmarks.bench_classify
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_parser import build_message
+from models.classify import classify, clear_model_cache
+from models.filter_classifier import FILTER_LABELS, FilterClassifier
+from src.utils.email_parser import EmailParser
+
+
+P50_TARGET_MS = 10.0
+P99_TARGET_MS = 25.0
+
+
+def main():
+    parser_args = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser_args.add_argument('--messages', type=int, default=2000)
+    args = parser_args.parse_args()
+
+    messages = [build_message(i, attachments=i % 2) for i in range(args.messages)]
+
+    parser = EmailParser()
+    training = []
+    for i, raw in enumerate(messages[:500]):
+        features = parser.parse_email_content(raw)
+        features['filter_label'] = FILTER_LABELS[i % len(FILTER_LABELS)]
+        training.append(features)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        classifier = FilterClassifier()
+        classifier.fit_stream([training[i:i + 100] for i in range(0, len(training), 100)])
+        model_path = classifier.save(os.path.join(tmp, 'model.joblib'))
+
+        clear_model_cache()
+        start = time.perf_counter()
+        classify(messages[0], model_path)
+        cold_ms = (time.perf_counter() - start) * 1000
+
+        latencies = []
+        for raw in messages:
+            start = time.perf_counter()
+            classify(raw, model_path)
+            latencies.append((time.perf_counter() - start) * 1000)
+        clear_model_cache()
+
+    p50, p99 = np.percentile(latencies, [50, 99])
+
+    print("📊 classify() latency benchmark")
+    print(f"   - Messages: {len(latencies)}")
+    print(f"   - Cold start (model load + first message): {cold_ms:.1f} ms")
+    print(f"   - p50: {p50:.2f} ms (target {P50_TARGET_MS} ms) {'✅' if p50 <= P50_TARGET_MS else '❌'}")
+    print(f"   - p99: {p99:.2f} ms (target {P99_TARGET_MS} ms) {'✅' if p99 <= P99_TARGET_MS else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
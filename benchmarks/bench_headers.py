@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Header-Only Parsing Benchmark
+
+Compares full parsing with the header-only mode of EmailParser on large,
+attachment-heavy messages.
+
+Run from the project root:
+    python -m benchmarks.bench_headers
+"""
+
+import argparse
+import time
+
+from benchmarks.bench_parser import build_message
+from src.utils.email_parser import EmailParser
+
+
+def time_rate(func, messages) -> float:
+    """Return messages/second for calling func on every message."""
+    start = time.perf_counter()
+    for raw in messages:
+        func(raw)
+    elapsed = time.perf_counter() - start
+    return len(messages) / elapsed if elapsed else float('inf')
+
+
+def main():
+    parser_args = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser_args.add_argument('--messages', type=int, default=50)
+    parser_args.add_argument('--attachments', type=int, default=40,
+                             help="16 KB attachments per message")
+    args = parser_args.parse_args()
+
+    messages = [build_message(i, args.attachments).encode('utf-8') for i in range(args.messages)]
+    parser = EmailParser()
+    average_kb = sum(len(raw) for raw in messages) / len(messages) / 1024
+
+    full = time_rate(parser.parse_email_bytes, messages)
+    headers = time_rate(lambda raw: parser.parse_email_bytes(raw, headers_only=True), messages)
+
+    print("📊 Header-only parsing benchmark")
+    print(f"   - Messages: {len(messages)} (~{average_kb:,.0f} KB, {args.attachments} attachments each)")
+    print(f"   - Full parse:   {full:,.1f} messages/second")
+    print(f"   - Headers only: {headers:,.1f} messages/second")
+    print(f"   - Speedup: {headers / full:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
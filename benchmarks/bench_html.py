@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+HTML to Text Benchmark
+
+Measures MB/second for html_to_text against the regex tag stripping used
+before it (re.sub of <[^>]+>) on large synthetic newsletters, and reports
+how much style and script content each approach leaks into the text.
+It also checks that documents full of unclosed tags are converted in
+linear time.
+
+Run from the project root:
+    python -m benchmarks.bench_html
+"""
+
+import argparse
+import random
+import re
+import time
+
+from src.preprocessing.html_text import DEFAULT_MAX_HTML_CHARS, html_to_text
+
+
+WORDS = ['weekly', 'deals', 'Exclusive', 'offer', 'members', 'shipping', 'free',
+         'update', 'new', 'arrivals', 'café', 'naïve', 'save', 'today']
+ENTITIES = ['&amp;', '&nbsp;', '&eacute;', '&#8212;', '&rsquo;', '&copy;']
+
+# Marker words only present inside style and script blocks
+LEAK_MARKERS = ('font-family', 'trackOpen')
+
+
+def build_newsletter(rng: random.Random, rows: int) -> str:
+    """Build a table-layout marketing email with inline CSS, scripts and tracking links."""
+    css = ''.join(f".c{i} {{ font-family: Arial, sans-serif; color: #{rng.randrange(16 ** 6):06x}; "
+                  f"padding: {rng.randrange(20)}px; }}\n" for i in range(300))
+    cells = []
+    for row in range(rows):
+        words = ' '.join(rng.choice(WORDS + ENTITIES) for _ in range(rng.randint(8, 30)))
+        cells.append(
+            f'<tr><td class="c{row % 300}" style="padding:0;margin:0" align="left">'
+            f'<a href="https://click.example.com/t?u={rng.randrange(10 ** 9)}&amp;r={row}">'
+            f'<img src="https://cdn.example.com/i/{row}.png" alt="" width="600"></a>'
+            f'<h2>{rng.choice(WORDS).title()} {rng.choice(WORDS)}</h2>'
+            f'<p>{words} <b>{rng.choice(WORDS)}</b> <span>{rng.choice(WORDS)}</span></p>'
+            f'</td></tr>\n')
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>Newsletter</title>'
+            f'<style type="text/css">{css}</style>'
+            f'<script>function trackOpen() {{ return "<p>" + {rng.randrange(1000)}; }}</script>'
+            f'</head><body><table width="100%">{"".join(cells)}</table>'
+            f'<!-- footer --><p>Unsubscribe &middot; Preferences</p></body></html>')
+
+
+def regex_strip(markup: str) -> str:
+    """Previous behaviour: drop anything that looks like a tag."""
+    return re.sub(r'<[^>]+>', '', markup)
+
+
+def measure(convert, documents, max_chars=None):
+    start = time.perf_counter()
+    if max_chars is None:
+        texts = [convert(document) for document in documents]
+    else:
+        texts = [convert(document, max_chars) for document in documents]
+    return time.perf_counter() - start, texts
+
+
+def leaks(texts) -> int:
+    return sum(text.count(marker) for text in texts for marker in LEAK_MARKERS)
+
+
+def unclosed_tag_seconds(unit: str, size: int) -> float:
+    """Time html_to_text on a document repeating an unclosed tag up to size characters."""
+    document = unit * (size // len(unit))
+    start = time.perf_counter()
+    html_to_text(document, max_chars=size)
+    return time.perf_counter() - start
+
+
+def main():
+    parser_args = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser_args.add_argument('--messages', type=int, default=50)
+    parser_args.add_argument('--rows', type=int, default=400,
+                             help='Table rows per newsletter (about 0.5 KB each)')
+    parser_args.add_argument('--seed', type=int, default=0)
+    args = parser_args.parse_args()
+
+    rng = random.Random(args.seed)
+    documents = [build_newsletter(rng, args.rows) for _ in range(args.messages)]
+    megabytes = sum(len(document) for document in documents) / 1024 ** 2
+
+    print("📊 HTML to text benchmark")
+    print(f"   - Newsletters: {args.messages:,} ({megabytes / args.messages * 1024:,.0f} KB each)")
+
+    regex_seconds, regex_texts = measure(regex_strip, documents)
+    html_seconds, html_texts = measure(html_to_text, documents, max_chars=max(map(len, documents)))
+    capped_seconds, _ = measure(html_to_text, documents, max_chars=DEFAULT_MAX_HTML_CHARS)
+
+    print(f"\n   regex <[^>]+> (before):")
+    print(f"   - Throughput: {megabytes / regex_seconds:,.1f} MB/second")
+    print(f"   - Style/script leaks: {leaks(regex_texts):,}")
+    print(f"   - Characters per message: {sum(map(len, regex_texts)) // len(documents):,}")
+
+    print(f"\n   html_to_text (after):")
+    print(f"   - Throughput: {megabytes / html_seconds:,.1f} MB/second")
+    print(f"   - Style/script leaks: {leaks(html_texts):,}")
+    print(f"   - Characters per message: {sum(map(len, html_texts)) // len(documents):,}")
+    print(f"   - With the default {DEFAULT_MAX_HTML_CHARS // 1024} KB cap: "
+          f"{capped_seconds / len(documents) * 1000:,.2f} ms/message")
+
+    # Hostile input: 8x the characters must cost about 8x the time, not 64x
+    print(f"\n   unclosed tags (up to the {DEFAULT_MAX_HTML_CHARS // 1024} KB cap):")
+    for unit in ('a<b ', '<!-', '<a href="x" '):
+        small = unclosed_tag_seconds(unit, DEFAULT_MAX_HTML_CHARS // 8)
+        large = unclosed_tag_seconds(unit, DEFAULT_MAX_HTML_CHARS)
+        print(f"   - {unit!r:<16} {large * 1000:,.1f} ms ({large / small:.1f}x the time for 1/8 of the input)")
+        assert large < 1.0 and large / small < 24, f"{unit!r}: html_to_text is not linear"
+
+
+if __name__ == "__main__":
+    main()
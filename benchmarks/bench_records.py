@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Parsed Record Memory Benchmark
+
+Measures the memory held by parsed emails, extrapolated to 100k messages,
+for the previous dict records (subject kept as an email header object,
+senders and domains not interned), plain dicts of the current values and
+the slotted ParsedEmail records returned by EmailParser.
+
+Run from the project root:
+    python -m benchmarks.bench_records
+"""
+
+import argparse
+import email
+import gc
+import tracemalloc
+
+from benchmarks.corpus import REALISTIC_PROFILE, build_profile_corpus
+from src.utils.email_parser import _ANGLE_ADDRESS_RE, EmailParser
+
+
+def legacy_record(parser: EmailParser, raw: str) -> dict:
+    """Reproduce the previous dict record for comparison."""
+    msg = email.message_from_string(raw, policy=parser.policy)
+    subject = msg.get('subject', '') or 'No Subject'
+    sender = msg.get('from', '')
+    match = _ANGLE_ADDRESS_RE.search(sender)
+    if match:
+        sender = match.group(1)
+    content, attachments = parser._walk_parts(msg)
+    return {
+        'subject': subject,
+        'sender': sender,
+        'recipients': parser._extract_recipients(msg),
+        'date': parser._extract_date(msg),
+        'content': content,
+        'has_attachments': bool(attachments),
+        'content_length': len(content),
+        'subject_length': len(subject),
+        'sender_domain': sender.split('@')[1] if '@' in sender else '',
+    }
+
+
+def retained_bytes(build) -> int:
+    """Bytes still allocated after build() returns, while its result is alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
+
+
+def main():
+    parser_args = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser_args.add_argument('--messages', type=int, default=1000)
+    parser_args.add_argument('--seed', type=int, default=0)
+    args = parser_args.parse_args()
+
+    corpus = build_profile_corpus(REALISTIC_PROFILE, args.messages, args.seed)
+    parser = EmailParser()
+    scale = 100000 / args.messages
+
+    variants = [
+        ('dict records (before)', lambda: [legacy_record(parser, raw) for raw in corpus]),
+        ('dict of current values', lambda: [parser.parse_email_content(raw).to_dict() for raw in corpus]),
+        ('ParsedEmail (after)', lambda: [parser.parse_email_content(raw) for raw in corpus]),
+    ]
+
+    print("📊 Parsed record memory benchmark")
+    print(f"   - Messages parsed: {args.messages:,} ({REALISTIC_PROFILE} profile)")
+    body_chars = sum(len(parser.parse_email_content(raw)['content']) for raw in corpus)
+    print(f"   - Body text alone: {body_chars * scale / 1e6:,.1f}M characters per 100k")
+    print()
+
+    baseline = None
+    for name, build in variants:
+        size = retained_bytes(build) * scale
+        baseline = baseline or size
+        print(f"   - {name:<24} {size / 1e6:>8,.1f} MB per 100k messages "
+              f"({size / baseline:.0%} of before)")
+
+
+if __name__ == "__main__":
+    main()
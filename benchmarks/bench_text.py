@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Text Cleaning Benchmark
+
+Measures rows/second for the per-string clean_text functions and for
+TextCleaner.clean_batch over a Series of email bodies, and checks that
+both paths produce identical output, including on edge cases such as
+NUL characters and tags split across texts.
+
+Run from the project root:
+    python -m benchmarks.bench_text
+"""
+
+import argparse
+import random
+import re
+import string
+import time
+
+import pandas as pd
+
+from src.preprocessing.preprocess import PREPROCESS_CLEANER, TOKEN_CLEANER
+
+
+WORDS = ['meeting', 'Invoice', 'project', 'NEWSLETTER', 'order', 'shipped',
+         'security', 'login', 'prize', 'update', 'café', 'naïve', 'über']
+FRAGMENTS = ['<p>', '</p>', '<a href="https://example.com">', '$150.00', '#12345',
+             '2024-01-15', '!!!', ' -- ', '\n\n', '\t', '(50% off)', '«quote»']
+
+# Texts that could trip up the joined-block path of clean_batch
+EDGE_CASES = ['a\x00b', '<a\x00b>c', '\x00', 'x <b', 'c> y', '<p', '>', '',
+              'Café\x00Ünïcode ５ <i>!</i>', '\x00<br>\x00', 'end <']
+
+
+def build_bodies(rows: int, words_per_body: int = 80, seed: int = 0) -> pd.Series:
+    """Build a Series of synthetic bodies mixing words, markup, numbers and symbols."""
+    rng = random.Random(seed)
+    pool = WORDS * 3 + FRAGMENTS
+    return pd.Series([' '.join(rng.choice(pool) for _ in range(words_per_body))
+                      for _ in range(rows)])
+
+
+def legacy_preprocess_clean(text):
+    """Previous src/preprocessing/preprocess.py clean_text."""
+    text = text.lower()
+    text = re.sub(r'<[^>]+>', '', text)
+    text = re.sub(r'\d+', '', text)
+    text = text.translate(str.maketrans('', '', string.punctuation))
+    return text.strip()
+
+
+def legacy_token_clean(text):
+    """Previous src/utils/email_parser.py clean_text."""
+    if not text:
+        return ""
+    text = text.lower()
+    text = re.sub(r'[^\w\s]', ' ', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def rate(rows: int, seconds: float) -> str:
+    return f"{rows / seconds:,.0f} rows/second"
+
+
+def main():
+    parser_args = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser_args.add_argument('--rows', type=int, default=100000)
+    args = parser_args.parse_args()
+
+    bodies = build_bodies(args.rows)
+
+    print("📊 clean_text benchmark")
+    print(f"   - Bodies: {args.rows:,}")
+
+    for name, legacy, cleaner in [('preprocess', legacy_preprocess_clean, PREPROCESS_CLEANER),
+                                  ('email_parser', legacy_token_clean, TOKEN_CLEANER)]:
+        expected = [legacy(text) for text in EDGE_CASES]
+        assert [cleaner.clean(text) for text in EDGE_CASES] == expected, f"{name}: clean differs on edge cases"
+        without_nul = [text for text in EDGE_CASES if '\x00' not in text]
+        assert cleaner.clean_batch(EDGE_CASES).tolist() == expected, f"{name}: batch differs on edge cases"
+        assert cleaner.clean_batch(without_nul).tolist() == [legacy(text) for text in without_nul], \
+            f"{name}: joined batch differs on edge cases"
+
+        start = time.perf_counter()
+        expected = [legacy(text) for text in bodies]
+        legacy_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cleaned = cleaner.clean_batch(bodies)
+        batch_seconds = time.perf_counter() - start
+
+        assert cleaned.tolist() == expected, f"{name}: batch output differs"
+
+        print(f"\n   {name}:")
+        print(f"   - Per-string (before): {rate(args.rows, legacy_seconds)}")
+        print(f"   - clean_batch (after): {rate(args.rows, batch_seconds)}")
+        print(f"   - Speedup: {legacy_seconds / batch_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
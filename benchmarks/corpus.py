@@ -0,0 +1,134 @@
+"""
+Synthetic Benchmark Corpora
+
+Builds reproducible sets of raw RFC822 messages whose shape can be varied
+independently: body size, multipart nesting depth, number and size of
+attachments, and whether an HTML alternative is included. PROFILES names
+the shapes the benchmark suite runs by default; the 'realistic' profile
+instead draws a labelled mix from src.utils.synthetic_corpus.
+"""
+
+import random
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Dict, List
+
+from src.utils.synthetic_corpus import SyntheticCorpusGenerator
+
+
+PROFILES: Dict[str, Dict] = {
+    'plain_small': {'body_words': 60, 'depth': 0, 'attachments': 0, 'html': False},
+    'plain_large': {'body_words': 5000, 'depth': 0, 'attachments': 0, 'html': False},
+    'html_alternative': {'body_words': 300, 'depth': 1, 'attachments': 0, 'html': True},
+    'nested_multipart': {'body_words': 300, 'depth': 4, 'attachments': 0, 'html': True},
+    'attachments': {'body_words': 300, 'depth': 1, 'attachments': 4, 'html': True,
+                    'attachment_kb': 64},
+}
+
+REALISTIC_PROFILE = 'realistic'
+
+PROFILE_NAMES = list(PROFILES) + [REALISTIC_PROFILE]
+
+WORDS = ['meeting', 'project', 'invoice', 'payment', 'order', 'shipped', 'security',
+         'login', 'account', 'newsletter', 'update', 'review', 'budget', 'report',
+         'deadline', 'team', 'customer', 'delivery', 'prize', 'offer', 'research',
+         'the', 'and', 'for', 'with', 'your', 'this', 'week', 'please', 'today']
+DOMAINS = ['company.com', 'tech.com', 'service.com', 'shop.com', 'bank.com', 'ai.org',
+           'mail.example.net', 'news.example.org']
+SUBJECTS = ['Meeting tomorrow at {n}pm', 'Weekly Newsletter #{n}', 'Your invoice #{n} is ready',
+            'Your order #{n} has shipped', 'Security alert - login {n}', 'Project status {n}']
+
+
+def build_message(index: int, rng: random.Random, body_words: int = 300, depth: int = 1,
+                  attachments: int = 0, html: bool = True, attachment_kb: int = 16) -> str:
+    """
+    Build one synthetic message.
+    
+    Args:
+        index: Message number, used in headers
+        rng: Random source for subject, sender and body words
+        body_words: Number of words in the text body
+        depth: Multipart nesting depth (0 for a single text/plain part)
+        attachments: Number of binary attachments
+        html: Add a text/html alternative of the body
+        attachment_kb: Size of each attachment in KB
+        
+    Returns:
+        Raw RFC822 message as string
+    """
+    words = [rng.choice(WORDS) for _ in range(body_words)]
+    lines = [' '.join(words[start:start + 12]) for start in range(0, len(words), 12)]
+    body = '\n'.join(lines) + '\n'
+    
+    if depth == 0 and not attachments:
+        msg = MIMEText(body, 'plain')
+    else:
+        if html:
+            msg = MIMEMultipart('alternative')
+            msg.attach(MIMEText(body, 'plain'))
+            msg.attach(MIMEText(f"<html><body><p>{'</p><p>'.join(lines)}</p></body></html>",
+                                'html'))
+        else:
+            msg = MIMEMultipart('mixed')
+            msg.attach(MIMEText(body, 'plain'))
+        
+        # Each extra level wraps the previous tree in a multipart/mixed with a note
+        for level in range(1, depth):
+            outer = MIMEMultipart('mixed')
+            outer.attach(msg)
+            outer.attach(MIMEText(f"Forwarded at level {level}.\n", 'plain'))
+            msg = outer
+        
+        if attachments:
+            outer = MIMEMultipart('mixed')
+            outer.attach(msg)
+            for n in range(attachments):
+                payload = rng.randbytes(attachment_kb * 1024)
+                part = MIMEApplication(payload, 'octet-stream')
+                part.add_header('Content-Disposition', 'attachment', filename=f'file_{index}_{n}.bin')
+                outer.attach(part)
+            msg = outer
+    
+    domain = rng.choice(DOMAINS)
+    msg['Subject'] = rng.choice(SUBJECTS).format(n=index)
+    msg['From'] = f"Sender {index % 97} <user{index % 97}@{domain}>"
+    msg['To'] = 'me@example.com'
+    msg['Date'] = f"Mon, 15 Jan 2024 {index % 24:02d}:{index % 60:02d}:00 +0000"
+    # Fixed boundaries; the generator would otherwise pick random ones
+    for number, part in enumerate(part for part in msg.walk() if part.is_multipart()):
+        part.set_boundary(f"=====boundary_{index}_{number}=====")
+    return msg.as_string()
+
+
+def build_corpus(count: int, seed: int = 0, **shape) -> List[str]:
+    """
+    Build a reproducible list of messages of one shape.
+    
+    Args:
+        count: Number of messages
+        seed: Random seed; the same seed and shape give identical messages
+        **shape: Keyword arguments for build_message
+        
+    Returns:
+        List of raw RFC822 messages
+    """
+    rng = random.Random(seed)
+    return [build_message(index, rng, **shape) for index in range(count)]
+
+
+def build_profile_corpus(profile: str, count: int, seed: int = 0) -> List[str]:
+    """
+    Build the corpus of a named profile.
+    
+    Args:
+        profile: A key of PROFILES, or REALISTIC_PROFILE
+        count: Number of messages
+        seed: Random seed
+        
+    Returns:
+        List of raw RFC822 messages
+    """
+    if profile == REALISTIC_PROFILE:
+        return [raw_email for _, raw_email in SyntheticCorpusGenerator(seed=seed).messages(count)]
+    return build_corpus(count, seed=seed, **PROFILES[profile])
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+
+Times the parsing, cleaning and feature-extraction entry points on the
+synthetic corpora of benchmarks.corpus and writes the results as JSON.
+Passing an earlier results file as --baseline compares every benchmark
+with it and exits with status 1 if any got slower than the tolerance.
+
+Run from the project root:
+    python -m benchmarks.suite --output outputs/benchmarks.json
+    python -m benchmarks.suite --baseline outputs/benchmarks.json
+    python -m benchmarks.suite --mbox data/synthetic.mbox --profiles realistic
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.corpus import PROFILE_NAMES, build_profile_corpus
+from src.preprocessing import preprocess
+from src.utils import email_parser
+from src.utils.email_parser import EmailParser
+from src.utils.mailbox_reader import iter_mbox
+
+
+RESULTS_SCHEMA_VERSION = 1
+
+DEFAULT_TOLERANCE = 0.15
+
+DEFAULT_MIN_PASS_SECONDS = 0.2
+
+
+def _parse_workload(messages: List[str], bodies: List[str]) -> Tuple[Callable, int]:
+    parser = EmailParser()
+    return lambda: [parser.parse_email_content(raw) for raw in messages], len(messages)
+
+
+def _preprocess_clean_workload(messages: List[str], bodies: List[str]) -> Tuple[Callable, int]:
+    return lambda: [preprocess.clean_text(body) for body in bodies], len(bodies)
+
+
+def _token_clean_workload(messages: List[str], bodies: List[str]) -> Tuple[Callable, int]:
+    return lambda: [email_parser.clean_text(body) for body in bodies], len(bodies)
+
+
+def _keywords_workload(messages: List[str], bodies: List[str]) -> Tuple[Callable, int]:
+    return lambda: [email_parser.extract_keywords(body) for body in bodies], len(bodies)
+
+
+def _features_workload(messages: List[str], bodies: List[str]) -> Tuple[Callable, int]:
+    parser = EmailParser()
+    records = [{'content': raw, 'filter_label': 'work'} for raw in messages]
+    return lambda: parser.extract_features_for_ml(records), len(records)
+
+
+# Each workload factory returns (callable running one pass, items per pass)
+BENCHMARKS: Dict[str, Callable] = {
+    'parse_email_content': _parse_workload,
+    'clean_text.preprocess': _preprocess_clean_workload,
+    'clean_text.email_parser': _token_clean_workload,
+    'extract_keywords': _keywords_workload,
+    'extract_features_for_ml': _features_workload,
+}
+
+
+def time_workload(run: Callable, repeat: int,
+                  min_seconds: float = DEFAULT_MIN_PASS_SECONDS) -> List[float]:
+    """
+    Time repeated passes of a workload, with garbage collection paused.
+    
+    Short workloads are looped until a timed pass takes at least
+    min_seconds, so timer resolution and scheduler noise stay small.
+    
+    Returns:
+        Seconds per single run of the workload, one entry per pass
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        if time.perf_counter() - start >= min_seconds:
+            break
+        loops *= 2
+    
+    timings = []
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(loops):
+                run()
+            timings.append((time.perf_counter() - start) / loops)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return timings
+
+
+def environment() -> Dict:
+    """Describe the machine and code version the results were measured on."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'parser_version': email_parser.PARSER_VERSION,
+        'git_commit': commit,
+    }
+
+
+def run_suite(messages: int = 200, repeat: int = 5, seed: int = 0,
+              profiles: Optional[List[str]] = None,
+              benchmarks: Optional[List[str]] = None,
+              mbox_path: Optional[str] = None) -> Dict:
+    """
+    Run the selected benchmarks on the selected corpus profiles.
+    
+    Args:
+        messages: Messages generated per profile
+        repeat: Timed passes per benchmark (after calibration runs)
+        seed: Corpus seed
+        profiles: Profile names from benchmarks.corpus.PROFILE_NAMES (all by
+            default, or none when mbox_path is given)
+        benchmarks: Benchmark names from BENCHMARKS (all by default)
+        mbox_path: Also benchmark the first messages of this mbox file,
+            reported under the profile name "mbox:<file name>"
+        
+    Returns:
+        Results dictionary in the JSON format written by main()
+    """
+    corpora = [(profile, lambda profile=profile: build_profile_corpus(profile, messages, seed))
+               for profile in profiles or ([] if mbox_path else PROFILE_NAMES)]
+    if mbox_path:
+        corpora.append((f"mbox:{os.path.basename(mbox_path)}",
+                        lambda: _read_mbox(mbox_path, messages)))
+    
+    results = {}
+    for profile, load_corpus in corpora:
+        corpus = load_corpus()
+        corpus_bytes = sum(len(raw.encode('utf-8')) for raw in corpus)
+        parser = EmailParser()
+        bodies = [parser.parse_email_content(raw).get('content', '') for raw in corpus]
+        
+        for name in benchmarks or list(BENCHMARKS):
+            run, items = BENCHMARKS[name](corpus, bodies)
+            timings = time_workload(run, repeat)
+            best = min(timings)
+            results[f"{name}[{profile}]"] = {
+                'benchmark': name,
+                'profile': profile,
+                'items': items,
+                'corpus_bytes': corpus_bytes,
+                'seconds_min': best,
+                'seconds_median': statistics.median(timings),
+                # Best-of-N is the least noisy estimate of the achievable rate
+                'items_per_second': items / best if best else float('inf'),
+            }
+    
+    return {
+        'schema_version': RESULTS_SCHEMA_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': environment(),
+        'settings': {'messages': messages, 'repeat': repeat, 'seed': seed, 'mbox': mbox_path},
+        'results': results,
+    }
+
+
+def _read_mbox(path: str, count: int) -> List[str]:
+    """Read the first count messages of an mbox file as strings."""
+    corpus = []
+    for _, raw_email in iter_mbox(path):
+        corpus.append(raw_email.decode('utf-8', 'replace'))
+        if len(corpus) >= count:
+            break
+    return corpus
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE) -> List[Dict]:
+    """
+    Compare two results files benchmark by benchmark.
+    
+    Args:
+        current: Results of this run
+        baseline: Earlier results to compare against
+        tolerance: Allowed fractional slowdown before a benchmark counts as
+            a regression
+        
+    Returns:
+        One dictionary per benchmark present in both, with the throughput
+        ratio (current / baseline) and a regression flag
+    """
+    if baseline.get('schema_version') != RESULTS_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported baseline schema version: {baseline.get('schema_version')}")
+    
+    comparisons = []
+    for key, result in current['results'].items():
+        previous = baseline['results'].get(key)
+        if previous is None:
+            continue
+        ratio = result['items_per_second'] / previous['items_per_second']
+        comparisons.append({'key': key, 'ratio': ratio, 'regression': ratio < 1 - tolerance})
+    return comparisons
+
+
+def print_results(results: Dict, comparisons: Optional[List[Dict]] = None) -> None:
+    """Print a results table, with baseline ratios if given."""
+    ratios = {comparison['key']: comparison for comparison in comparisons or []}
+    print("📊 Benchmark suite")
+    print(f"   - Python {results['environment']['python']}, parser version "
+          f"{results['environment']['parser_version']}, commit {results['environment']['git_commit']}")
+    for key, result in results['results'].items():
+        line = f"   - {key:<50} {result['items_per_second']:>12,.0f} items/second"
+        if key in ratios:
+            marker = "❌" if ratios[key]['regression'] else "✅"
+            line += f"  {marker} {ratios[key]['ratio']:.2f}x baseline"
+        print(line)
+
+
+def main():
+    parser_args = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser_args.add_argument('--messages', type=int, default=200)
+    parser_args.add_argument('--repeat', type=int, default=5)
+    parser_args.add_argument('--seed', type=int, default=0)
+    parser_args.add_argument('--profiles', help="Comma-separated profiles: " + ', '.join(PROFILE_NAMES))
+    parser_args.add_argument('--benchmarks', help="Comma-separated benchmarks: " + ', '.join(BENCHMARKS))
+    parser_args.add_argument('--mbox', help="Also benchmark messages read from this mbox file")
+    parser_args.add_argument('--output', help="Write results to this JSON file")
+    parser_args.add_argument('--baseline', help="Compare with an earlier results file")
+    parser_args.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    args = parser_args.parse_args()
+    
+    results = run_suite(args.messages, args.repeat, args.seed,
+                        args.profiles.split(',') if args.profiles else None,
+                        args.benchmarks.split(',') if args.benchmarks else None,
+                        args.mbox)
+    
+    comparisons = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            comparisons = compare(results, json.load(f), args.tolerance)
+    print_results(results, comparisons)
+    
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+    
+    if comparisons and any(comparison['regression'] for comparison in comparisons):
+        print(f"\n❌ Throughput regressions beyond {args.tolerance:.0%} detected")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
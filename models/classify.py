@@ -0,0 +1,87 @@
+"""
+Real-Time Classification
+
+This module classifies single incoming messages. The trained model is
+loaded once per process on first use and kept in a cache; its weight
+arrays are memory-mapped from the saved file, so loading is cheap and
+several worker processes share the same pages. When a RuleEngine is
+given, messages matching a user filter are labelled without the model.
+"""
+
+import threading
+from typing import Dict, Optional, Union
+
+import joblib
+
+from models.filter_classifier import DEFAULT_MODEL_PATH, FilterClassifier
+from models.rule_engine import RuleEngine
+from src.utils.email_parser import EmailParser
+
+
+_model_cache: Dict[str, FilterClassifier] = {}
+_cache_lock = threading.Lock()
+_parser: Optional[EmailParser] = None
+
+
+def get_model(model_path: str = DEFAULT_MODEL_PATH) -> FilterClassifier:
+    """
+    Get a trained classifier, loading it on first use.
+    
+    Args:
+        model_path: Path to a model saved with FilterClassifier.save
+        
+    Returns:
+        Cached FilterClassifier
+    """
+    model = _model_cache.get(model_path)
+    if model is None:
+        with _cache_lock:
+            model = _model_cache.get(model_path)
+            if model is None:
+                model = joblib.load(model_path, mmap_mode='r')
+                _model_cache[model_path] = model
+    return model
+
+
+def clear_model_cache() -> None:
+    """Drop all cached models, e.g. after retraining."""
+    with _cache_lock:
+        _model_cache.clear()
+
+
+def classify(raw_email: Union[str, bytes, memoryview], model_path: str = DEFAULT_MODEL_PATH,
+             rules: Optional[RuleEngine] = None) -> Dict:
+    """
+    Classify one raw email.
+    
+    Args:
+        raw_email: Raw RFC822 message as string, bytes or memoryview
+        model_path: Path to a model saved with FilterClassifier.save
+        rules: Rules tried before the model; the model is only loaded and
+            used for emails no rule matches
+        
+    Returns:
+        Dictionary with the predicted 'label', its 'confidence' and its
+        'source': 'rule' (with the matching 'rule' name), 'model', or
+        'none' for an email that cannot be parsed, which is labelled
+        'unknown' with confidence 0.0
+    """
+    global _parser
+    if _parser is None:
+        _parser = EmailParser()
+    
+    if isinstance(raw_email, (bytes, bytearray, memoryview)):
+        features = _parser.parse_email_bytes(raw_email)
+    else:
+        features = _parser.parse_email_content(raw_email)
+    
+    if not features:
+        return {'label': 'unknown', 'confidence': 0.0, 'source': 'none'}
+    
+    if rules is not None:
+        result = rules.classify(features)
+        if result is not None:
+            return result
+    
+    label, confidence = get_model(model_path).predict_one(features)
+    return {'label': label, 'confidence': confidence, 'source': 'model'}
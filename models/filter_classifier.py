@@ -0,0 +1,203 @@
+"""
+Filter Classifier
+
+This module trains a classifier that predicts an email's filter label
+(work, newsletter, billing, spam, ...) from hashed subject, body and sender
+domain features. Training is out-of-core: batches are streamed through
+SGDClassifier.partial_fit, so the archive never has to fit in memory.
+
+Train from a labeled CSV or a mailbox, from the project root:
+    python -m models.filter_classifier --csv data/sample_emails.csv
+    python -m models.filter_classifier --mailbox work.mbox --label work
+"""
+
+import argparse
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.special import expit
+from sklearn.linear_model import SGDClassifier
+
+from src.preprocessing.hashed_features import HashedFeatureExtractor, Records
+
+
+# Labels used by the project's sample data
+FILTER_LABELS = ['work', 'newsletter', 'billing', 'spam', 'shopping', 'security']
+
+DEFAULT_MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'outputs', 'filter_classifier.joblib'
+)
+
+
+class FilterClassifier:
+    """Incrementally trainable email filter-label classifier."""
+    
+    def __init__(self, classes: Iterable[str] = FILTER_LABELS,
+                 extractor: Optional[HashedFeatureExtractor] = None,
+                 alpha: float = 1e-5, random_state: int = 42):
+        """
+        Initialize an untrained classifier.
+        
+        Args:
+            classes: All filter labels the model can predict; partial_fit
+                needs the full set up front
+            extractor: Feature extractor (a default HashedFeatureExtractor if None)
+            alpha: Regularization strength of the linear model
+            random_state: Seed for reproducible training
+        """
+        self.classes = np.array(sorted(set(classes)), dtype=object)
+        self.extractor = extractor or HashedFeatureExtractor()
+        self.model = SGDClassifier(loss='log_loss', alpha=alpha, random_state=random_state)
+        self.trained_messages = 0
+    
+    def partial_fit(self, records: Records, label_column: str = 'filter_label') -> int:
+        """
+        Update the model with one batch of labeled emails.
+        
+        Emails whose label is not in self.classes are skipped.
+        
+        Args:
+            records: DataFrame or list of feature dictionaries
+            label_column: Column holding each email's filter label
+            
+        Returns:
+            Number of emails used for training
+        """
+        df = records if isinstance(records, pd.DataFrame) else pd.DataFrame(records)
+        if df.empty or label_column not in df:
+            return 0
+        
+        labels = df[label_column].astype(str).str.strip()
+        known = labels.isin(self.classes).to_numpy()
+        if not known.any():
+            return 0
+        
+        X = self.extractor.transform(df[known])
+        self.model.partial_fit(X, labels[known].to_numpy(dtype=object), classes=self.classes)
+        self.trained_messages += int(known.sum())
+        return int(known.sum())
+    
+    def fit_stream(self, batches: Iterable[Records], label_column: str = 'filter_label') -> Dict:
+        """
+        Train on a stream of batches in a single pass.
+        
+        Args:
+            batches: Iterable of DataFrames or lists of feature dictionaries,
+                e.g. from src.utils.mailbox_reader.iter_feature_batches or
+                src.utils.data_collector.iter_email_csv
+            label_column: Column holding each email's filter label
+            
+        Returns:
+            Dictionary with messages, skipped, batches, seconds and
+            messages_per_second
+        """
+        stats = {'messages': 0, 'skipped': 0, 'batches': 0}
+        start = time.perf_counter()
+        
+        for batch in batches:
+            used = self.partial_fit(batch, label_column)
+            stats['messages'] += used
+            stats['skipped'] += len(batch) - used
+            stats['batches'] += 1
+        
+        stats['seconds'] = time.perf_counter() - start
+        stats['messages_per_second'] = (stats['messages'] / stats['seconds']
+                                        if stats['seconds'] else 0.0)
+        return stats
+    
+    def predict(self, records: Records) -> np.ndarray:
+        """Predict the filter label of each email."""
+        return self.model.predict(self.extractor.transform(records))
+    
+    def predict_proba(self, records: Records) -> np.ndarray:
+        """Predict label probabilities, with columns in self.classes order."""
+        return self.model.predict_proba(self.extractor.transform(records))
+    
+    def predict_one(self, features: Dict) -> Tuple[str, float]:
+        """
+        Predict the filter label of a single parsed email, with low latency.
+        
+        Scores are computed from only the model weights of the email's
+        non-zero features, which avoids the per-call validation and dense
+        matrix products of predict_proba. Probabilities match predict_proba
+        (one-vs-rest logistic scores, normalized).
+        
+        Args:
+            features: Feature dictionary as produced by EmailParser
+            
+        Returns:
+            Tuple of (predicted label, probability of that label)
+        """
+        X = self.extractor.transform_one(features)
+        scores = self.model.coef_[:, X.indices] @ X.data + self.model.intercept_
+        
+        probabilities = expit(scores)
+        if len(self.model.classes_) == 2:
+            probabilities = np.array([1.0 - probabilities[0], probabilities[0]])
+        else:
+            probabilities /= probabilities.sum()
+        
+        best = int(np.argmax(probabilities))
+        return str(self.model.classes_[best]), float(probabilities[best])
+    
+    def save(self, path: str = DEFAULT_MODEL_PATH) -> str:
+        """
+        Save the classifier.
+        
+        Args:
+            path: Output file path
+            
+        Returns:
+            Path to the saved file
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        joblib.dump(self, path)
+        return path
+    
+    @staticmethod
+    def load(path: str = DEFAULT_MODEL_PATH) -> 'FilterClassifier':
+        """Load a classifier saved with save()."""
+        return joblib.load(path)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Train the email filter classifier out-of-core")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--csv', help="Labeled CSV with subject, sender, content, filter_label")
+    source.add_argument('--mailbox', help="mbox file or Maildir directory")
+    parser.add_argument('--label', help="Filter label for every message in --mailbox")
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--output', default=DEFAULT_MODEL_PATH)
+    args = parser.parse_args(argv)
+    
+    if args.mailbox:
+        from src.utils.mailbox_reader import iter_feature_batches
+        if not args.label:
+            parser.error("--mailbox needs --label")
+        classes = sorted(set(FILTER_LABELS) | {args.label})
+        batches = iter_feature_batches(args.mailbox, batch_size=args.batch_size, label=args.label)
+    else:
+        from src.utils.data_collector import iter_email_csv
+        classes = FILTER_LABELS
+        batches = iter_email_csv(args.csv, columns=['subject', 'sender', 'content', 'filter_label'],
+                                 chunksize=args.batch_size)
+    
+    # Import by module path so the pickled class is not bound to __main__
+    from models.filter_classifier import FilterClassifier as ImportableClassifier
+    
+    classifier = ImportableClassifier(classes=classes)
+    stats = classifier.fit_stream(batches)
+    path = classifier.save(args.output)
+    
+    print(f"✅ Trained on {stats['messages']} emails in {stats['batches']} batches "
+          f"({stats['skipped']} skipped with unknown labels)")
+    print(f"⚡ Throughput: {stats['messages_per_second']:,.0f} emails/second")
+    print(f"📁 Model saved to: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Rule-Based Pre-Filter
+
+This module routes emails by user filters before any model is consulted.
+Rules match the sender address, the sender domain (including subdomains),
+or keywords and phrases in the subject or body. They are compiled into
+hash indexes for senders and domains and one combined pattern per text
+field, so a message is checked against thousands of rules with a few
+dictionary lookups and one scan of each text.
+
+Rule files are JSON lists such as:
+    [{"label": "billing", "field": "sender_domain", "value": "service.com"},
+     {"label": "security", "field": "subject", "value": "new login", "priority": 10}]
+"""
+
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+
+# Fields rules can match on, most specific first; the order breaks ties
+RULE_FIELDS = ('sender', 'sender_domain', 'subject', 'body')
+
+# Feature dictionary key holding each text field
+_TEXT_FEATURES = {'subject': 'subject', 'body': 'content'}
+
+
+class Rule:
+    """One user filter: emails whose field matches value get label."""
+    
+    __slots__ = ('label', 'field', 'value', 'priority', 'name', '_order')
+    
+    def __init__(self, label: str, field: str, value: str, priority: int = 0,
+                 name: Optional[str] = None):
+        """
+        Initialize a rule.
+        
+        Args:
+            label: Filter label assigned on a match
+            field: One of RULE_FIELDS
+            value: Sender address, domain, or keyword/phrase to look for
+            priority: Higher priority rules win when several match
+            name: Optional rule name reported with matches
+        """
+        if field not in RULE_FIELDS:
+            raise ValueError(f"Unknown rule field {field!r}; expected one of {RULE_FIELDS}")
+        if not value or not value.strip():
+            raise ValueError("Rule value must not be empty")
+        
+        self.label = label
+        self.field = field
+        self.value = value
+        self.priority = priority
+        self.name = name or f"{field}:{value}"
+        self._order = 0
+    
+    def rank(self) -> Tuple[int, int, int]:
+        """Sort key; the highest rank wins among matching rules."""
+        return (self.priority, -RULE_FIELDS.index(self.field), -self._order)
+    
+    def to_dict(self) -> Dict:
+        return {'label': self.label, 'field': self.field, 'value': self.value,
+                'priority': self.priority, 'name': self.name}
+    
+    def __repr__(self) -> str:
+        return f"Rule({self.label!r}, {self.field!r}, {self.value!r}, priority={self.priority})"
+
+
+class RuleEngine:
+    """Compiled set of rules applied to EmailParser feature dictionaries."""
+    
+    def __init__(self, rules: Iterable = ()):
+        """
+        Initialize the engine.
+        
+        Args:
+            rules: Rule objects or dictionaries with Rule's arguments
+        """
+        self.rules: List[Rule] = []
+        self._compiled = False
+        for rule in rules:
+            self.add(rule if isinstance(rule, Rule) else Rule(**rule))
+    
+    def add(self, rule: Rule) -> None:
+        """Add a rule; the indexes are rebuilt on the next match."""
+        rule._order = len(self.rules)
+        self.rules.append(rule)
+        self._compiled = False
+    
+    def add_rule(self, label: str, field: str, value: str, priority: int = 0,
+                 name: Optional[str] = None) -> Rule:
+        """Create and add a rule (see Rule for the arguments)."""
+        rule = Rule(label, field, value, priority, name)
+        self.add(rule)
+        return rule
+    
+    def __len__(self) -> int:
+        return len(self.rules)
+    
+    def compile(self) -> None:
+        """
+        Build the lookup structures.
+        
+        Senders and domains go into dictionaries keyed by their lowercase
+        value. Keywords of each text field are merged into a trie and
+        turned into a single regular expression, so one scan of the text
+        finds every keyword; only the best rule per value is kept.
+        """
+        self._senders: Dict[str, Rule] = {}
+        self._domains: Dict[str, Rule] = {}
+        self._keywords: Dict[str, Dict[str, Rule]] = {field: {} for field in _TEXT_FEATURES}
+        
+        for rule in self.rules:
+            if rule.field == 'sender':
+                index, key = self._senders, rule.value.strip().lower()
+            elif rule.field == 'sender_domain':
+                index, key = self._domains, rule.value.strip().lower().lstrip('@.')
+            else:
+                index, key = self._keywords[rule.field], _normalize_phrase(rule.value)
+            current = index.get(key)
+            if current is None or rule.rank() > current.rank():
+                index[key] = rule
+        
+        self._patterns = {field: _compile_trie(keywords) for field, keywords in self._keywords.items()}
+        self._best_keyword_rank = {field: max((rule.rank() for rule in keywords.values()), default=None)
+                                   for field, keywords in self._keywords.items()}
+        self._compiled = True
+    
+    def match(self, features: Dict) -> Optional[Rule]:
+        """
+        Find the best rule matching a parsed email.
+        
+        Args:
+            features: Feature dictionary as produced by EmailParser
+        
+        Returns:
+            The matching rule with the highest priority (ties go to the more
+            specific field, then the earlier rule), or None
+        """
+        if not self._compiled:
+            self.compile()
+        
+        best: Optional[Rule] = None
+        
+        sender = str(features.get('sender') or '').strip().lower()
+        if sender:
+            best = self._senders.get(sender)
+        
+        domain = str(features.get('sender_domain') or '').strip().lower()
+        if not domain and '@' in sender:
+            domain = sender.rsplit('@', 1)[1]
+        # Walk from the full domain up to its parents: a.b.com, b.com, com
+        while domain:
+            rule = self._domains.get(domain)
+            if rule is not None and (best is None or rule.rank() > best.rank()):
+                best = rule
+            domain = domain.partition('.')[2]
+        
+        for field, feature in _TEXT_FEATURES.items():
+            pattern = self._patterns[field]
+            # Skip the scan when no keyword rule could beat the current match
+            if pattern is None or (best is not None and best.rank() > self._best_keyword_rank[field]):
+                continue
+            text = features.get(feature)
+            if not text:
+                continue
+            rule = self._scan(field, pattern, str(text))
+            if rule is not None and (best is None or rule.rank() > best.rank()):
+                best = rule
+        
+        return best
+    
+    def _scan(self, field: str, pattern: re.Pattern, text: str) -> Optional[Rule]:
+        """Find the best keyword rule whose keyword occurs in text."""
+        keywords = self._keywords[field]
+        best = None
+        for match in pattern.finditer(text.lower()):
+            # The pattern matches the longest keyword at each position;
+            # shorter keywords that are word prefixes of it match too
+            words = match.group(1).split()
+            for count in range(len(words), 0, -1):
+                rule = keywords.get(' '.join(words[:count]))
+                if rule is not None and (best is None or rule.rank() > best.rank()):
+                    best = rule
+        return best
+    
+    def classify(self, features: Dict) -> Optional[Dict]:
+        """
+        Classify a parsed email by rules alone.
+        
+        Args:
+            features: Feature dictionary as produced by EmailParser
+        
+        Returns:
+            Dictionary with 'label', 'confidence' (1.0), 'source' ('rule')
+            and the matching 'rule' name, or None if no rule matches
+        """
+        rule = self.match(features)
+        if rule is None:
+            return None
+        return {'label': rule.label, 'confidence': 1.0, 'source': 'rule', 'rule': rule.name}
+    
+    def apply(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Match every row of a feature DataFrame.
+        
+        Args:
+            df: DataFrame from EmailParser.extract_features_for_ml
+        
+        Returns:
+            Series of matched labels (missing where no rule matches)
+        """
+        labels = []
+        for features in df.to_dict('records'):
+            rule = self.match(features)
+            labels.append(rule.label if rule is not None else None)
+        return pd.Series(labels, index=df.index, name='rule_label', dtype='string')
+    
+    def save(self, path: str) -> str:
+        """
+        Save the rules as a JSON list.
+        
+        Args:
+            path: Output file path
+        
+        Returns:
+            Path to the saved file
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump([rule.to_dict() for rule in self.rules], f, indent=2)
+        return path
+    
+    @classmethod
+    def load(cls, path: str) -> 'RuleEngine':
+        """
+        Load rules saved with save() or written by hand.
+        
+        Args:
+            path: Path to a JSON list of rule dictionaries
+        
+        Returns:
+            RuleEngine with the rules
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+
+def mine_domain_rules(df: pd.DataFrame, min_count: int = 20, min_purity: float = 0.98,
+                      label_column: str = 'filter_label') -> List[Rule]:
+    """
+    Derive sender_domain rules from labelled emails.
+    
+    A domain becomes a rule when it sent at least min_count emails and at
+    least min_purity of them carry the same label, as is typical for
+    newsletters, billing and security notifications.
+    
+    Args:
+        df: DataFrame with sender_domain and label columns
+        min_count: Minimum number of emails from the domain
+        min_purity: Minimum share of the domain's emails with its top label
+        label_column: Column holding the filter labels
+    
+    Returns:
+        List of rules, most frequent domains first
+    """
+    domains = df['sender_domain'].astype('string').str.strip().str.lower()
+    counts = (pd.DataFrame({'domain': domains, 'label': df[label_column].astype('string')})
+              .dropna().query("domain != ''")
+              .groupby(['domain', 'label'], observed=True).size())
+    
+    rules = []
+    for domain, label_counts in counts.groupby(level='domain', sort=False):
+        total = int(label_counts.sum())
+        top = label_counts.droplevel('domain').sort_values(ascending=False)
+        if total >= min_count and top.iloc[0] / total >= min_purity:
+            rules.append((total, Rule(str(top.index[0]), 'sender_domain', domain)))
+    
+    rules.sort(key=lambda item: -item[0])
+    return [rule for _, rule in rules]
+
+
+def _normalize_phrase(value: str) -> str:
+    """Lowercase a keyword and collapse its whitespace."""
+    return ' '.join(value.lower().split())
+
+
+def _compile_trie(keywords: Iterable[str]) -> Optional[re.Pattern]:
+    """
+    Compile keywords into one regular expression shaped like their trie.
+    
+    Keywords sharing a prefix share its branch, so the regex engine tests
+    each input position against the trie instead of every keyword. The
+    pattern is a zero-width lookahead, so matches starting inside another
+    match are found as well; group 1 holds the longest keyword at a
+    position, which must start and end at word boundaries.
+    """
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+    if not trie:
+        return None
+    return re.compile(r'(?<!\w)(?=(' + _trie_regex(trie) + r')(?!\w))')
+
+
+def _trie_regex(node: Dict) -> str:
+    """Turn a trie node into a regex; longer continuations are tried first."""
+    branches = []
+    for char, child in sorted((item for item in node.items() if item[0] != ''),
+                              key=lambda item: item[0]):
+        atom = r'\s+' if char == ' ' else re.escape(char)
+        branches.append(atom + _trie_regex(child))
+    
+    if not branches:
+        return ''
+    if len(branches) == 1 and '' not in node:
+        return branches[0]
+    
+    pattern = '(?:' + '|'.join(branches) + ')'
+    # A keyword ends here: the rest is optional, but preferred when it matches
+    return pattern + '?' if '' in node else pattern
@@ -97,24 +97,23 @@ def run_data_exploration():
     print("\n📊 Running quick data exploration...")
     
     try:
-        import pandas as pd
-        import matplotlib.pyplot as plt
+        from src.utils.data_collector import summarize_email_csv
         
-        # Load sample data
-        df = pd.read_csv('data/sample_emails.csv')
+        # Compute statistics in one chunked pass instead of loading the whole file
+        summary = summarize_email_csv('data/sample_emails.csv')
         
-        print(f"📧 Loaded {len(df)} sample emails")
-        print(f"🏷️  Categories: {list(df['filter_label'].unique())}")
+        print(f"📧 Loaded {summary['rows']} sample emails")
+        print(f"🏷️  Categories: {summary['categories']}")
         
         # Show basic statistics
         print("\n📈 Basic Statistics:")
-        print(f"   - Average subject length: {df['subject'].str.len().mean():.1f} characters")
-        print(f"   - Average content length: {df['content'].str.len().mean():.1f} characters")
-        print(f"   - Most common category: {df['filter_label'].value_counts().index[0]}")
+        print(f"   - Average subject length: {summary['avg_subject_length']:.1f} characters")
+        print(f"   - Average content length: {summary['avg_content_length']:.1f} characters")
+        print(f"   - Most common category: {next(iter(summary['label_counts']))}")
         
         # Show sample emails
         print("\n📋 Sample Emails:")
-        for i, (_, row) in enumerate(df.head(3).iterrows(), 1):
+        for i, (_, row) in enumerate(summary['preview'].iterrows(), 1):
             print(f"   {i}. {row['subject']} ({row['filter_label']})")
         
         print("\n✅ Data exploration complete!")
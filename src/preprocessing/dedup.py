@@ -0,0 +1,217 @@
+"""
+Near-Duplicate Detection
+
+This module finds near-identical emails (repeated newsletters, notification
+templates) with MinHash signatures and locality-sensitive hashing. Each
+email is compared only with the few emails sharing one of its LSH buckets,
+so clustering a corpus takes roughly linear rather than quadratic time.
+"""
+
+import zlib
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.preprocessing.preprocess import TOKEN_CLEANER
+
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_HASH_MASK = np.uint64(0xFFFFFFFF)
+
+# Shingles hashed per step by MinHashLSH.signature (num_perm x 4096 x 8 bytes)
+_SIGNATURE_BLOCK = 4096
+
+
+class MinHashLSH:
+    """MinHash signatures with a banded LSH index for near-duplicate lookup."""
+    
+    def __init__(self, num_perm: int = 128, bands: int = 32, threshold: float = 0.7,
+                 shingle_size: int = 3, seed: int = 1):
+        """
+        Initialize an empty index.
+        
+        Args:
+            num_perm: Number of hash permutations per signature
+            bands: Number of LSH bands; num_perm must be divisible by it.
+                More bands find more candidate pairs at lower similarity
+            threshold: Minimum estimated Jaccard similarity of word shingles
+                for two emails to count as near-duplicates
+            shingle_size: Number of consecutive words per shingle
+            seed: Seed for the hash permutations
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self._b = rng.randint(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64)
+        
+        self.keys: List[Hashable] = []
+        self._signatures: List[np.ndarray] = []
+        # Band bucket -> position of the first email that landed in it
+        self._buckets: List[Dict[bytes, int]] = [{} for _ in range(bands)]
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    def signature(self, text: str, cleaned: bool = False) -> np.ndarray:
+        """
+        Compute the MinHash signature of a text.
+        
+        Args:
+            text: Text to hash
+            cleaned: Whether the text is already normalized with TOKEN_CLEANER
+            
+        Returns:
+            Array of num_perm uint32 values
+        """
+        words = (text if cleaned else TOKEN_CLEANER.clean(text)).split()
+        shingles = self._shingle_hashes(words)
+        
+        # Shingles are hashed block by block into a running minimum, so the
+        # num_perm x block intermediate stays small however long the text is
+        signature = np.full(len(self._a), _HASH_MASK, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for start in range(0, len(shingles), _SIGNATURE_BLOCK):
+                block = shingles[start:start + _SIGNATURE_BLOCK]
+                hashed = (np.outer(self._a, block) + self._b[:, None]) % _MERSENNE_PRIME
+                np.minimum(signature, (hashed & _HASH_MASK).min(axis=1), out=signature)
+        return signature.astype(np.uint32)
+    
+    def _shingle_hashes(self, words: List[str]) -> np.ndarray:
+        """Hash each run of shingle_size consecutive words to a 32-bit value."""
+        if not words:
+            return np.zeros(1, dtype=np.uint64)
+        
+        word_hashes = np.array([zlib.crc32(word.encode('utf-8')) for word in words], dtype=np.uint64)
+        size = min(self.shingle_size, len(word_hashes))
+        count = len(word_hashes) - size + 1
+        
+        # Combine word hashes position by position so word order matters
+        combined = np.zeros(count, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for offset in range(size):
+                combined = combined * np.uint64(1000003) ^ word_hashes[offset:offset + count]
+        return np.unique(combined & _HASH_MASK)
+    
+    def similarity(self, first: np.ndarray, second: np.ndarray) -> float:
+        """Estimate the Jaccard similarity of two signatures."""
+        return float(np.mean(first == second))
+    
+    def add(self, key: Hashable, text: str, cleaned: bool = False) -> Optional[Hashable]:
+        """
+        Add a text to the index.
+        
+        Args:
+            key: Identifier of the text
+            text: Text to index
+            cleaned: Whether the text is already normalized with TOKEN_CLEANER
+            
+        Returns:
+            Key of an earlier near-duplicate, or None if there is none
+        """
+        signature = self.signature(text, cleaned)
+        position = len(self.keys)
+        match = self._match(signature)
+        
+        self.keys.append(key)
+        self._signatures.append(signature)
+        for band, bucket in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(bucket, position)
+        
+        return None if match is None else self.keys[match]
+    
+    def query(self, text: str) -> Optional[Hashable]:
+        """
+        Find an indexed near-duplicate of a text without adding it.
+        
+        Args:
+            text: Text to look up
+            
+        Returns:
+            Key of a near-duplicate, or None if there is none
+        """
+        match = self._match(self.signature(text))
+        return None if match is None else self.keys[match]
+    
+    def _match(self, signature: np.ndarray) -> Optional[int]:
+        """Return the position of the most similar bucket-mate above the threshold."""
+        best, best_similarity = None, self.threshold
+        seen = set()
+        for band, bucket in enumerate(self._band_keys(signature)):
+            position = self._buckets[band].get(bucket)
+            if position is None or position in seen:
+                continue
+            seen.add(position)
+            similarity = self.similarity(signature, self._signatures[position])
+            if similarity >= best_similarity:
+                best, best_similarity = position, similarity
+        return best
+    
+    def _band_keys(self, signature: np.ndarray) -> Iterable[bytes]:
+        """Split a signature into its band bucket keys."""
+        raw = signature.tobytes()
+        width = self.rows * signature.itemsize
+        return (raw[start:start + width] for start in range(0, len(raw), width))
+
+
+def find_duplicate_clusters(df: pd.DataFrame, text_columns: Sequence[str] = ('subject', 'content'),
+                            **lsh_options) -> pd.Series:
+    """
+    Assign every email to a near-duplicate cluster.
+    
+    Each email joins the cluster of the first earlier email it is found to
+    be a near-duplicate of; emails without one start a new cluster.
+    
+    Args:
+        df: DataFrame of parsed emails
+        text_columns: Columns joined to form the compared text
+        **lsh_options: Options passed to MinHashLSH (threshold, bands, ...)
+        
+    Returns:
+        Series of integer cluster ids, aligned with df's index
+    """
+    texts = None
+    for column in text_columns:
+        cleaned = TOKEN_CLEANER.clean_batch(df[column] if column in df else [""] * len(df))
+        texts = cleaned if texts is None else texts.str.cat(cleaned.values, sep=' ')
+    
+    index = MinHashLSH(**lsh_options)
+    clusters = np.empty(len(df), dtype=np.int64)
+    for position, text in enumerate(texts if texts is not None else [""] * len(df)):
+        match = index.add(position, text, cleaned=True)
+        clusters[position] = position if match is None else clusters[match]
+    
+    # Renumber clusters 0..n-1 in order of first appearance
+    codes = pd.factorize(clusters)[0]
+    return pd.Series(codes, index=df.index, name='duplicate_cluster')
+
+
+def collapse_duplicates(df: pd.DataFrame, max_per_cluster: int = 1,
+                        text_columns: Sequence[str] = ('subject', 'content'),
+                        **lsh_options) -> pd.DataFrame:
+    """
+    Keep at most max_per_cluster emails from each near-duplicate cluster.
+    
+    Args:
+        df: DataFrame of parsed emails
+        max_per_cluster: Number of emails kept per cluster (earliest first)
+        text_columns: Columns joined to form the compared text
+        **lsh_options: Options passed to MinHashLSH (threshold, bands, ...)
+        
+    Returns:
+        Filtered DataFrame with duplicate_cluster and cluster_size columns
+    """
+    clusters = find_duplicate_clusters(df, text_columns, **lsh_options)
+    result = df.assign(duplicate_cluster=clusters,
+                       cluster_size=clusters.map(clusters.value_counts()))
+    return result[clusters.groupby(clusters).cumcount() < max_per_cluster]
@@ -0,0 +1,146 @@
+"""
+Hashed Feature Extraction
+
+This module turns EmailParser output into sparse feature matrices with the
+hashing trick. There is no vocabulary to fit or store, so the matrix width
+is fixed up front and batches can be transformed independently, keeping
+memory bounded no matter how many messages are processed.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from src.preprocessing.preprocess import TOKEN_CLEANER
+
+
+Records = Union[pd.DataFrame, List[Dict]]
+
+
+def _domain_parts(domain: str) -> List[str]:
+    """Split a domain into itself and its parent domains (a.b.com -> a.b.com, b.com, com)."""
+    parts = domain.lower().split('.') if domain else []
+    return ['.'.join(parts[i:]) for i in range(len(parts))]
+
+
+class HashedFeatureExtractor:
+    """Fixed-width sparse features for subject, body and sender domain."""
+    
+    def __init__(self, subject_features: int = 2 ** 16, body_features: int = 2 ** 18,
+                 domain_features: int = 2 ** 12, ngram_range: Tuple[int, int] = (1, 2)):
+        """
+        Initialize the extractor.
+        
+        Args:
+            subject_features: Number of hash buckets for subject n-grams
+            body_features: Number of hash buckets for body n-grams
+            domain_features: Number of hash buckets for sender domain parts
+            ngram_range: Word n-gram range for subject and body
+        """
+        text_options = dict(tokenizer=str.split, token_pattern=None, lowercase=False,
+                            ngram_range=ngram_range, alternate_sign=False, dtype=np.float32)
+        self.subject_vectorizer = HashingVectorizer(n_features=subject_features, **text_options)
+        self.body_vectorizer = HashingVectorizer(n_features=body_features, **text_options)
+        self.domain_vectorizer = HashingVectorizer(n_features=domain_features, analyzer=_domain_parts,
+                                                   alternate_sign=False, dtype=np.float32)
+    
+    @property
+    def n_features(self) -> int:
+        """Total width of the feature matrix."""
+        return (self.subject_vectorizer.n_features + self.body_vectorizer.n_features
+                + self.domain_vectorizer.n_features)
+    
+    def transform(self, records: Records) -> sp.csr_matrix:
+        """
+        Transform a batch of parsed emails into a sparse matrix.
+        
+        Args:
+            records: DataFrame or list of feature dictionaries with subject,
+                content and sender_domain (or sender, to derive it from)
+            
+        Returns:
+            CSR matrix of shape (len(records), n_features)
+        """
+        df = records if isinstance(records, pd.DataFrame) else pd.DataFrame(records)
+        
+        subjects = TOKEN_CLEANER.clean_batch(_column(df, 'subject'))
+        bodies = TOKEN_CLEANER.clean_batch(_column(df, 'content'))
+        domains = _sender_domains(df)
+        
+        return sp.hstack([
+            self.subject_vectorizer.transform(subjects),
+            self.body_vectorizer.transform(bodies),
+            self.domain_vectorizer.transform(domains)
+        ], format='csr')
+    
+    def transform_one(self, features: Dict) -> sp.csr_matrix:
+        """
+        Transform a single parsed email, skipping the DataFrame and batch
+        cleaning overhead of transform(); the result is identical.
+        
+        Args:
+            features: Feature dictionary as produced by EmailParser
+            
+        Returns:
+            CSR matrix of shape (1, n_features)
+        """
+        domain = features.get('sender_domain')
+        if domain is None:
+            sender = features.get('sender')
+            domain = sender.rsplit('@', 1)[1] if isinstance(sender, str) and '@' in sender else ""
+        
+        blocks = [
+            self.subject_vectorizer.transform([TOKEN_CLEANER.clean(features.get('subject'))]),
+            self.body_vectorizer.transform([TOKEN_CLEANER.clean(features.get('content'))]),
+            self.domain_vectorizer.transform([domain if isinstance(domain, str) else ""])
+        ]
+        
+        # Stack the single-row blocks by offsetting their column indices
+        indices = []
+        offset = 0
+        for block in blocks:
+            indices.append(block.indices + offset)
+            offset += block.shape[1]
+        data = np.concatenate([block.data for block in blocks])
+        return sp.csr_matrix((data, np.concatenate(indices), np.array([0, len(data)])),
+                             shape=(1, self.n_features))
+    
+    def iter_transform(self, batches: Iterable[Records],
+                       label_column: str = 'filter_label') -> Iterator[Tuple[sp.csr_matrix, np.ndarray]]:
+        """
+        Transform a stream of batches, one at a time.
+        
+        Args:
+            batches: Iterable of DataFrames or lists of feature dictionaries,
+                e.g. from src.utils.mailbox_reader.iter_feature_batches
+            label_column: Column holding each email's filter label
+            
+        Yields:
+            Tuples of (feature matrix, label array) per batch
+        """
+        for batch in batches:
+            df = batch if isinstance(batch, pd.DataFrame) else pd.DataFrame(batch)
+            if df.empty:
+                continue
+            labels = np.asarray(_column(df, label_column, 'unknown'), dtype=object)
+            yield self.transform(df), labels
+
+
+def _sender_domains(df: pd.DataFrame) -> List[str]:
+    """Return sender domains, deriving them from sender addresses if needed."""
+    if 'sender_domain' in df:
+        values = df['sender_domain'].tolist()
+    else:
+        values = [sender.rsplit('@', 1)[1] if isinstance(sender, str) and '@' in sender else ""
+                  for sender in _column(df, 'sender')]
+    return ["" if not isinstance(domain, str) else domain for domain in values]
+
+
+def _column(df: pd.DataFrame, column: str, default: str = "") -> List:
+    """Return a column as a list, or defaults if the column is missing."""
+    if column in df:
+        return df[column].tolist()
+    return [default] * len(df)
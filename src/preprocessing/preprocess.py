@@ -1,9 +1,178 @@
 import re
 import string
+from typing import Iterable, List, Union
+
+import pandas as pd
+
+from src.utils import instrumentation
+
+
+# Joins texts into one block for clean_batch; no cleaning step touches it
+_BATCH_SEPARATOR = '\x00'
+
+# Patterns are compiled once
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+
+# Tag pattern for joined blocks, which must not span two batched texts
+_BATCH_HTML_TAG_RE = re.compile(r'<[^>' + _BATCH_SEPARATOR + r']+>')
+
+_ASCII_BYTES = bytes(range(128))
+_ASCII_DIGITS = string.digits.encode('ascii')
+_ASCII_PUNCTUATION = string.punctuation.encode('ascii')
+_ASCII_NON_WORD = bytes(c for c in range(128) if _NON_WORD_RE.match(chr(c)))
+
+
+class TextCleaner:
+    """
+    Configurable text normalization pipeline.
+    
+    Steps run in a fixed order: lowercase, strip HTML tags, strip numbers,
+    handle punctuation, collapse whitespace, strip the ends. Character-level
+    steps run as a single bytes.translate over the UTF-8 text, plus one
+    str.replace per distinct non-ASCII character that needs changing, so
+    the cost is a few C-level passes regardless of how many rules apply.
+    clean_batch() joins many texts into one block so those passes run once
+    per block instead of once per text.
+    """
+    
+    def __init__(self, lowercase: bool = True, strip_html: bool = False,
+                 strip_numbers: bool = False, punctuation: str = 'ascii',
+                 collapse_whitespace: bool = False, batch_size: int = 10000):
+        """
+        Initialize the cleaner.
+        
+        Args:
+            lowercase: Convert text to lowercase
+            strip_html: Remove anything that looks like an HTML tag
+            strip_numbers: Remove digits (any Unicode decimal digit)
+            punctuation: 'ascii' deletes ASCII punctuation, 'non_word' replaces
+                every non-word, non-space character with a space, None keeps it
+            collapse_whitespace: Replace whitespace runs with a single space
+            batch_size: Number of texts joined per block in clean_batch
+        """
+        if punctuation not in ('ascii', 'non_word', None):
+            raise ValueError("punctuation must be 'ascii', 'non_word' or None")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        self.lowercase = lowercase
+        self.strip_html = strip_html
+        self.strip_numbers = strip_numbers
+        self.punctuation = punctuation
+        self.collapse_whitespace = collapse_whitespace
+        self.batch_size = batch_size
+        
+        delete = _ASCII_DIGITS if strip_numbers else b''
+        if punctuation == 'ascii':
+            delete += _ASCII_PUNCTUATION
+        table = bytearray(range(256))
+        if punctuation == 'non_word':
+            for byte in _ASCII_NON_WORD:
+                table[byte] = ord(' ')
+        self._byte_table = bytes(table)
+        # Joined blocks keep the separator so they can be split again
+        table[ord(_BATCH_SEPARATOR)] = ord(_BATCH_SEPARATOR)
+        self._batch_byte_table = bytes(table)
+        self._byte_delete = delete
+    
+    def clean(self, text: str) -> str:
+        """
+        Clean a single text.
+        
+        Args:
+            text: Raw text to clean
+            
+        Returns:
+            Cleaned text ("" for empty or missing input)
+        """
+        if not text or not isinstance(text, str):
+            return ""
+        return self._finish(self._transform(text))
+    
+    def clean_batch(self, texts: Union[pd.Series, Iterable[str]]) -> pd.Series:
+        """
+        Clean many texts at once.
+        
+        Args:
+            texts: Series, list or array of raw texts; missing values and
+                non-strings are treated as empty
+            
+        Returns:
+            Series of cleaned texts (keeping the input's index for a Series)
+        """
+        index = texts.index if isinstance(texts, pd.Series) else None
+        values = ["" if not isinstance(text, str) else text for text in texts]
+        
+        with instrumentation.stage('clean_batch', items=len(values)) as stage:
+            if instrumentation.active() is not None:
+                stage.bytes = sum(map(len, values))
+            cleaned: List[str] = []
+            for start in range(0, len(values), self.batch_size):
+                cleaned.extend(self._clean_block(values[start:start + self.batch_size]))
+        
+        return pd.Series(cleaned, index=index, dtype=object)
+    
+    def _clean_block(self, values: List[str]) -> List[str]:
+        """Clean a block of texts by transforming them as one joined string."""
+        joined = _BATCH_SEPARATOR.join(values)
+        
+        # Texts that contain the separator themselves are cleaned one by one
+        if joined.count(_BATCH_SEPARATOR) != len(values) - 1:
+            return [self.clean(text) for text in values]
+        
+        transformed = self._transform(joined, batched=True).split(_BATCH_SEPARATOR)
+        return [self._finish(text) for text in transformed]
+    
+    def _transform(self, text: str, batched: bool = False) -> str:
+        """
+        Apply the lowercase, HTML and character-level steps.
+        
+        With batched=True, text is a block joined by _clean_block and the
+        separators between its texts are left in place.
+        """
+        if self.lowercase:
+            text = text.lower()
+        if self.strip_html:
+            text = (_BATCH_HTML_TAG_RE if batched else _HTML_TAG_RE).sub('', text)
+        
+        if not self._byte_delete and self.punctuation != 'non_word':
+            return text
+        
+        # ASCII never occurs inside a multi-byte UTF-8 sequence, so the ASCII
+        # rules can be applied to the encoded bytes directly
+        data = text.encode('utf-8', 'surrogatepass')
+        table = self._batch_byte_table if batched else self._byte_table
+        translated = data.translate(table, self._byte_delete)
+        result = translated.decode('utf-8', 'surrogatepass')
+        
+        if not text.isascii():
+            non_ascii = data.translate(None, _ASCII_BYTES).decode('utf-8', 'surrogatepass')
+            for char in set(non_ascii):
+                if self.strip_numbers and char.isdecimal():
+                    result = result.replace(char, '')
+                elif self.punctuation == 'non_word' and _NON_WORD_RE.match(char):
+                    result = result.replace(char, ' ')
+        
+        return result
+    
+    def _finish(self, text: str) -> str:
+        """Collapse whitespace if configured and strip the ends."""
+        if self.collapse_whitespace:
+            return ' '.join(text.split())
+        return text.strip()
+
+
+# Behaviour of clean_text below: drop tags, numbers and ASCII punctuation
+PREPROCESS_CLEANER = TextCleaner(strip_html=True, strip_numbers=True, punctuation='ascii')
+
+# Behaviour of src.utils.email_parser.clean_text: symbols become word breaks
+TOKEN_CLEANER = TextCleaner(punctuation='non_word', collapse_whitespace=True)
+
 
 def clean_text(text):
-    text = text.lower()
-    text = re.sub(r'<[^>]+>', '', text)  # Remove HTML tags
-    text = re.sub(r'\d+', '', text)      # Remove numbers
-    text = text.translate(str.maketrans('', '', string.punctuation))
-    return text.strip()
\ No newline at end of file
+    if instrumentation.active() is None:
+        return PREPROCESS_CLEANER.clean(text)
+    with instrumentation.stage('clean_text.preprocess',
+                               bytes=len(text) if isinstance(text, str) else 0):
+        return PREPROCESS_CLEANER.clean(text)
@@ -8,9 +8,94 @@ It includes functions to help export emails from different email clients.
 import os
 import csv
 import json
-from typing import List, Dict, Optional
+from collections import Counter
+from typing import TYPE_CHECKING, Iterator, List, Dict, Optional
 import pandas as pd
 
+if TYPE_CHECKING:
+    from src.utils.sync_state import SyncStateStore
+
+
+# Column types of the email CSV format, so chunked reads skip type inference
+EMAIL_CSV_DTYPES = {
+    'id': 'string',
+    'subject': 'string',
+    'sender': 'string',
+    'content': 'string',
+    'date': 'string',
+    'filter_label': 'string'
+}
+
+DEFAULT_CSV_CHUNKSIZE = 50000
+
+# Labelled example emails used for sample data and synthetic corpora
+SAMPLE_EMAILS = [
+    {
+        'id': '1',
+        'subject': 'Meeting tomorrow at 2pm',
+        'sender': 'colleague@company.com',
+        'content': 'Hi, let\'s meet tomorrow at 2pm to discuss the project. Please bring your notes.',
+        'date': '2024-01-15 10:30:00',
+        'filter_label': 'work'
+    },
+    {
+        'id': '2',
+        'subject': 'Weekly Newsletter - Tech Updates',
+        'sender': 'newsletter@tech.com',
+        'content': 'This week\'s top tech news: AI developments, new programming languages, and industry trends.',
+        'date': '2024-01-15 09:00:00',
+        'filter_label': 'newsletter'
+    },
+    {
+        'id': '3',
+        'subject': 'Your invoice #12345 is ready',
+        'sender': 'billing@service.com',
+        'content': 'Your invoice for $150.00 is ready for payment. Due date: January 30, 2024.',
+        'date': '2024-01-15 08:15:00',
+        'filter_label': 'billing'
+    },
+    {
+        'id': '4',
+        'subject': 'You won a prize!',
+        'sender': 'spam@fake.com',
+        'content': 'Congratulations! You\'ve won $1,000,000! Click here to claim your prize!',
+        'date': '2024-01-15 07:45:00',
+        'filter_label': 'spam'
+    },
+    {
+        'id': '5',
+        'subject': 'Project status update',
+        'sender': 'manager@company.com',
+        'content': 'The Q1 project is on track. We need to review the budget next week.',
+        'date': '2024-01-14 16:30:00',
+        'filter_label': 'work'
+    },
+    {
+        'id': '6',
+        'subject': 'Your order has shipped',
+        'sender': 'orders@shop.com',
+        'content': 'Your order #45678 has been shipped and will arrive in 3-5 business days.',
+        'date': '2024-01-14 14:20:00',
+        'filter_label': 'shopping'
+    },
+    {
+        'id': '7',
+        'subject': 'Security alert - new login',
+        'sender': 'security@bank.com',
+        'content': 'We detected a new login to your account. If this wasn\'t you, please contact us immediately.',
+        'date': '2024-01-14 12:10:00',
+        'filter_label': 'security'
+    },
+    {
+        'id': '8',
+        'subject': 'Monthly digest - AI research',
+        'sender': 'research@ai.org',
+        'content': 'Latest AI research papers and breakthroughs in machine learning and neural networks.',
+        'date': '2024-01-14 11:00:00',
+        'filter_label': 'newsletter'
+    }
+]
+
 
 class EmailDataCollector:
     """Helper class for collecting email data from various sources."""
@@ -32,74 +117,31 @@ class EmailDataCollector:
         Returns:
             DataFrame with sample email data
         """
-        sample_emails = [
-            {
-                'id': '1',
-                'subject': 'Meeting tomorrow at 2pm',
-                'sender': 'colleague@company.com',
-                'content': 'Hi, let\'s meet tomorrow at 2pm to discuss the project. Please bring your notes.',
-                'date': '2024-01-15 10:30:00',
-                'filter_label': 'work'
-            },
-            {
-                'id': '2',
-                'subject': 'Weekly Newsletter - Tech Updates',
-                'sender': 'newsletter@tech.com',
-                'content': 'This week\'s top tech news: AI developments, new programming languages, and industry trends.',
-                'date': '2024-01-15 09:00:00',
-                'filter_label': 'newsletter'
-            },
-            {
-                'id': '3',
-                'subject': 'Your invoice #12345 is ready',
-                'sender': 'billing@service.com',
-                'content': 'Your invoice for $150.00 is ready for payment. Due date: January 30, 2024.',
-                'date': '2024-01-15 08:15:00',
-                'filter_label': 'billing'
-            },
-            {
-                'id': '4',
-                'subject': 'You won a prize!',
-                'sender': 'spam@fake.com',
-                'content': 'Congratulations! You\'ve won $1,000,000! Click here to claim your prize!',
-                'date': '2024-01-15 07:45:00',
-                'filter_label': 'spam'
-            },
-            {
-                'id': '5',
-                'subject': 'Project status update',
-                'sender': 'manager@company.com',
-                'content': 'The Q1 project is on track. We need to review the budget next week.',
-                'date': '2024-01-14 16:30:00',
-                'filter_label': 'work'
-            },
-            {
-                'id': '6',
-                'subject': 'Your order has shipped',
-                'sender': 'orders@shop.com',
-                'content': 'Your order #45678 has been shipped and will arrive in 3-5 business days.',
-                'date': '2024-01-14 14:20:00',
-                'filter_label': 'shopping'
-            },
-            {
-                'id': '7',
-                'subject': 'Security alert - new login',
-                'sender': 'security@bank.com',
-                'content': 'We detected a new login to your account. If this wasn\'t you, please contact us immediately.',
-                'date': '2024-01-14 12:10:00',
-                'filter_label': 'security'
-            },
-            {
-                'id': '8',
-                'subject': 'Monthly digest - AI research',
-                'sender': 'research@ai.org',
-                'content': 'Latest AI research papers and breakthroughs in machine learning and neural networks.',
-                'date': '2024-01-14 11:00:00',
-                'filter_label': 'newsletter'
-            }
-        ]
-        
-        return pd.DataFrame(sample_emails)
+        return pd.DataFrame(SAMPLE_EMAILS)
+    
+    def create_synthetic_mbox(self, count: int = 100000, filename: str = "synthetic.mbox",
+                              seed: int = 0) -> str:
+        """
+        Generate a large labelled mbox file from the sample emails.
+        
+        Messages are varied versions of create_sample_data's emails (see
+        src.utils.synthetic_corpus); the same seed gives the same file.
+        
+        Args:
+            count: Number of messages
+            filename: Name of the output file
+            seed: Corpus seed
+            
+        Returns:
+            Path to the saved file
+        """
+        from src.utils.synthetic_corpus import SyntheticCorpusGenerator
+        
+        filepath = os.path.join(self.output_dir, filename)
+        stats = SyntheticCorpusGenerator(seed=seed).write_mbox(filepath, count)
+        
+        print(f"✅ Generated {stats['messages']} emails ({stats['bytes'] / 1024 ** 2:,.1f} MB) in {filepath}")
+        return filepath
     
     def save_to_csv(self, df: pd.DataFrame, filename: str = "emails.csv") -> str:
         """
@@ -113,7 +155,9 @@ class EmailDataCollector:
             Path to the saved file
         """
         filepath = os.path.join(self.output_dir, filename)
-        df.to_csv(filepath, index=False)
+        with _stage('collector.save_to_csv', items=len(df)) as stage:
+            df.to_csv(filepath, index=False)
+            stage.bytes = _disk_size(filepath)
         print(f"✅ Saved {len(df)} emails to {filepath}")
         return filepath
     
@@ -129,9 +173,322 @@ class EmailDataCollector:
             Path to the saved file
         """
         filepath = os.path.join(self.output_dir, filename)
-        df.to_json(filepath, orient='records', indent=2)
+        with _stage('collector.save_to_json', items=len(df)) as stage:
+            df.to_json(filepath, orient='records', indent=2)
+            stage.bytes = _disk_size(filepath)
+        print(f"✅ Saved {len(df)} emails to {filepath}")
+        return filepath
+    
+    def save_to_parquet(self, df: pd.DataFrame, dataset_name: str = "emails_parquet",
+                        partition_by: Optional[str] = 'filter_label',
+                        compression: str = 'zstd') -> str:
+        """
+        Save email data as a compressed, partitioned Parquet dataset.
+        
+        Parquet keeps column types and lets readers load only the columns
+        and partitions they need. Saving to an existing dataset adds new
+        files to it, so streamed batches can be appended. Requires pyarrow.
+        
+        Args:
+            df: DataFrame containing email data
+            dataset_name: Name of the output directory
+            partition_by: 'filter_label', 'month' (derived from the date
+                column) or None for a single file per write
+            compression: Parquet compression codec (e.g. 'zstd', 'snappy')
+            
+        Returns:
+            Path to the saved dataset directory
+        """
+        pa, pq = _require_pyarrow()
+        
+        partition_cols = None
+        if partition_by == 'month':
+            dates = pd.to_datetime(df['date'], errors='coerce', utc=True)
+            df = df.assign(month=dates.dt.strftime('%Y-%m').fillna('unknown'))
+            partition_cols = ['month']
+        elif partition_by is not None:
+            partition_cols = [partition_by]
+        
+        dataset_path = os.path.join(self.output_dir, dataset_name)
+        with _stage('collector.save_to_parquet', items=len(df)):
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            pq.write_to_dataset(table, dataset_path, partition_cols=partition_cols,
+                                compression=compression)
+        print(f"✅ Saved {len(df)} emails to {dataset_path}")
+        return dataset_path
+    
+    def load_parquet(self, path: str, columns: Optional[List[str]] = None,
+                     filters: Optional[List] = None) -> pd.DataFrame:
+        """
+        Load email data from a Parquet file or dataset.
+        
+        Files are memory-mapped and only the requested columns are read.
+        
+        Args:
+            path: Path to a Parquet file or dataset directory
+            columns: Columns to load (all if None)
+            filters: Row filters on partition or data columns,
+                e.g. [('filter_label', '=', 'work')]
+            
+        Returns:
+            DataFrame with the requested data
+        """
+        pa, pq = _require_pyarrow()
+        with _stage('collector.load_parquet') as stage:
+            table = pq.read_table(path, columns=columns, filters=filters, memory_map=True)
+            stage.items = table.num_rows
+            stage.bytes = table.nbytes
+            return table.to_pandas()
+    
+    def save_to_arrow(self, df: pd.DataFrame, filename: str = "emails.arrow",
+                      compression: Optional[str] = None) -> str:
+        """
+        Save email data as an Arrow IPC (Feather v2) file.
+        
+        Uncompressed files can be memory-mapped by load_arrow without
+        copying; pass compression ('zstd' or 'lz4') to trade that for size.
+        Requires pyarrow.
+        
+        Args:
+            df: DataFrame containing email data
+            filename: Name of the output file
+            compression: None, 'zstd' or 'lz4'
+            
+        Returns:
+            Path to the saved file
+        """
+        _require_pyarrow()
+        from pyarrow import feather
+        
+        filepath = os.path.join(self.output_dir, filename)
+        with _stage('collector.save_to_arrow', items=len(df)) as stage:
+            feather.write_feather(df.reset_index(drop=True), filepath,
+                                  compression=compression or 'uncompressed')
+            stage.bytes = _disk_size(filepath)
         print(f"✅ Saved {len(df)} emails to {filepath}")
         return filepath
+    
+    def load_arrow(self, path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Load email data from an Arrow IPC file through a memory map.
+        
+        Args:
+            path: Path to a file written by save_to_arrow
+            columns: Columns to load (all if None)
+            
+        Returns:
+            DataFrame with the requested columns
+        """
+        _require_pyarrow()
+        from pyarrow import feather
+        
+        with _stage('collector.load_arrow') as stage:
+            table = feather.read_table(path, columns=columns, memory_map=True)
+            stage.items = table.num_rows
+            stage.bytes = table.nbytes
+            return table.to_pandas()
+    
+    def save_csv_in_chunks(self, source_path: str, filename: str = "emails.csv",
+                           chunksize: int = DEFAULT_CSV_CHUNKSIZE) -> str:
+        """
+        Copy an email CSV file into the output directory chunk by chunk.
+        
+        Args:
+            source_path: Path to the CSV file to copy
+            filename: Name of the output file
+            chunksize: Number of rows read per chunk
+            
+        Returns:
+            Path to the saved file
+        """
+        filepath = os.path.join(self.output_dir, filename)
+        total = 0
+        
+        with _stage('collector.save_csv_in_chunks', items=0) as stage:
+            for chunk in iter_email_csv(source_path, chunksize=chunksize):
+                chunk.to_csv(filepath, mode='w' if total == 0 else 'a',
+                             header=total == 0, index=False)
+                total += len(chunk)
+            stage.items = total
+            stage.bytes = _disk_size(source_path)
+        
+        print(f"✅ Saved {total} emails to {filepath}")
+        return filepath
+    
+    def save_mailbox_to_csv(self, source_path: str, filename: str = "emails.csv",
+                            label: str = 'unknown', batch_size: int = 500,
+                            incremental: bool = False,
+                            max_body_bytes: Optional[int] = None) -> str:
+        """
+        Stream an mbox file or Maildir directory into a CSV file.
+        
+        Messages are parsed and written in batches, so the mailbox is never
+        loaded into memory as a whole.
+        
+        Args:
+            source_path: Path to an mbox file or Maildir directory
+            filename: Name of the output file
+            label: Filter label assigned to every message from this source
+            batch_size: Number of messages parsed per batch
+            incremental: Only parse messages that arrived since the last
+                incremental run and append them to an existing file; progress
+                is kept in sync_state.json in the output directory
+            max_body_bytes: Keep at most this many bytes of each body in the
+                content column; full bodies can be read back with
+                src.utils.mailbox_reader.read_full_content(source_path, email_id)
+            
+        Returns:
+            Path to the saved file
+            
+        Raises:
+            ValueError: If incremental is set and the existing file's columns
+                are not FEATURE_COLUMNS (e.g. it was written by an older
+                version); new rows would not line up with its header
+        """
+        from src.utils.email_parser import EmailParser
+        from src.utils.feature_builder import FEATURE_COLUMNS, FeatureFrameBuilder
+        from src.utils.mailbox_reader import iter_feature_batches
+        
+        filepath = os.path.join(self.output_dir, filename)
+        sync_state = self.sync_state() if incremental else None
+        append = False
+        if incremental and os.path.exists(filepath):
+            with open(filepath, newline='', encoding='utf-8') as f:
+                header = next(csv.reader(f), None)
+            if header is not None and header != FEATURE_COLUMNS:
+                raise ValueError(
+                    f"{filepath} has columns {header}, not {FEATURE_COLUMNS}; "
+                    "write the mailbox to a new file or delete this one and its "
+                    "sync state to start over")
+            append = header is not None
+        total = 0
+        
+        with _stage('collector.save_mailbox_to_csv', items=0) as stage:
+            parser = EmailParser(max_body_bytes=max_body_bytes)
+            for batch in iter_feature_batches(source_path, parser=parser, batch_size=batch_size,
+                                              label=label, sync_state=sync_state):
+                # Built like extract_features_for_ml frames, so recipients are
+                # comma-joined and dates UTC rather than Python reprs
+                builder = FeatureFrameBuilder()
+                builder.extend(batch)
+                write_header = total == 0 and not append
+                builder.build().to_csv(
+                    filepath, mode='w' if write_header else 'a', header=write_header, index=False)
+                total += len(batch)
+            stage.items = total
+        
+        if append:
+            print(f"✅ Appended {total} new emails to {filepath}")
+        else:
+            print(f"✅ Saved {total} emails to {filepath}")
+        return filepath
+    
+    def sync_state(self) -> 'SyncStateStore':
+        """
+        Open the sync-state store kept in the output directory.
+        
+        Returns:
+            SyncStateStore used by incremental collection runs
+        """
+        from src.utils.sync_state import DEFAULT_SYNC_STATE_FILENAME, SyncStateStore
+        
+        return SyncStateStore(os.path.join(self.output_dir, DEFAULT_SYNC_STATE_FILENAME))
+
+
+def iter_email_csv(path: str, columns: Optional[List[str]] = None,
+                   chunksize: int = DEFAULT_CSV_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """
+    Read an email CSV file in chunks.
+    
+    Known columns are read with the types in EMAIL_CSV_DTYPES instead of
+    being inferred, and only the requested columns are parsed.
+    
+    Args:
+        path: Path to the CSV file
+        columns: Columns to read (all if None)
+        chunksize: Number of rows per chunk
+        
+    Returns:
+        Iterator of DataFrame chunks
+    """
+    dtypes = {column: dtype for column, dtype in EMAIL_CSV_DTYPES.items()
+              if columns is None or column in columns}
+    return pd.read_csv(path, usecols=columns, dtype=dtypes, chunksize=chunksize)
+
+
+def summarize_email_csv(path: str, chunksize: int = DEFAULT_CSV_CHUNKSIZE,
+                        preview_rows: int = 3) -> Dict:
+    """
+    Compute basic statistics of an email CSV file in one streaming pass.
+    
+    Args:
+        path: Path to a CSV file with subject, content and filter_label columns
+        chunksize: Number of rows read per chunk
+        preview_rows: Number of leading rows kept as a preview
+        
+    Returns:
+        Dictionary with rows, avg_subject_length, avg_content_length,
+        label_counts (most common first), categories (in order of first
+        appearance) and preview (DataFrame of the first rows)
+    """
+    rows = 0
+    length_sums = {'subject': 0, 'content': 0}
+    length_counts = {'subject': 0, 'content': 0}
+    label_counts = Counter()
+    preview = None
+    
+    for chunk in iter_email_csv(path, columns=['subject', 'content', 'filter_label'],
+                                chunksize=chunksize):
+        if preview is None:
+            preview = chunk.head(preview_rows)
+        rows += len(chunk)
+        
+        for column in length_sums:
+            lengths = chunk[column].str.len()
+            length_sums[column] += int(lengths.sum())
+            length_counts[column] += int(lengths.count())
+        
+        # value_counts(sort=False) keeps first-appearance order across chunks
+        label_counts.update(chunk['filter_label'].value_counts(sort=False).to_dict())
+    
+    def average(column):
+        return length_sums[column] / length_counts[column] if length_counts[column] else 0.0
+    
+    return {
+        'rows': rows,
+        'avg_subject_length': average('subject'),
+        'avg_content_length': average('content'),
+        'label_counts': dict(label_counts.most_common()),
+        'categories': list(label_counts),
+        'preview': preview if preview is not None else pd.DataFrame()
+    }
+
+
+def _stage(name: str, items: int = 1):
+    """Time a collector stage on the active instrumentation, if any."""
+    try:
+        from src.utils import instrumentation
+    except ImportError:
+        # Run as a script from src/utils, where instrumentation is never enabled
+        from contextlib import nullcontext
+        from types import SimpleNamespace
+        return nullcontext(SimpleNamespace())
+    return instrumentation.stage(name, items=items)
+
+
+def _disk_size(path: str) -> int:
+    """Size in bytes of a file, or 0 if it does not exist."""
+    return os.path.getsize(path) if os.path.isfile(path) else 0
+
+
+def _require_pyarrow():
+    """Import pyarrow for the columnar formats, with a helpful error if missing."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet/Arrow support needs pyarrow: pip install pyarrow") from e
+    return pa, pq
 
 
 def get_gmail_export_instructions() -> str:
@@ -156,12 +513,12 @@ Method 2: Manual Export
 2. Create labels for your email categories
 3. Manually categorize some emails
 4. Use Gmail's export feature (Settings > Accounts > Download data)
-5. Convert the .mbox file to CSV using a converter
+5. Convert the .mbox file to CSV with EmailDataCollector.save_mailbox_to_csv
 
 Method 3: Using IMAP
 1. Enable IMAP in Gmail settings
-2. Use Python's imaplib to connect
-3. Download emails and parse them
+2. Create an app password for your account
+3. Fetch new mail with src.utils.imap_fetcher.IMAPFetcher (one label per mailbox)
 4. Save as CSV with your filter labels
 
 Would you like me to create a script for any of these methods?
@@ -218,7 +575,7 @@ Method 1: Export Mailbox
 2. Select the mailbox you want to export
 3. Go to Mailbox > Export Mailbox
 4. Choose location and save as .mbox file
-5. Convert .mbox to CSV using a converter
+5. Convert .mbox to CSV with EmailDataCollector.save_mailbox_to_csv
 
 Method 2: Using Python
 1. Install the `mailbox` library
@@ -287,12 +644,11 @@ def main():
         file_path = input("\\nEnter path to your CSV file: ").strip()
         
         if os.path.exists(file_path):
-            df = pd.read_csv(file_path)
-            print(f"\\n✅ Loaded {len(df)} emails from {file_path}")
-            print(f"📊 Columns: {df.columns.tolist()}")
+            columns = pd.read_csv(file_path, nrows=0).columns.tolist()
+            print(f"\\n📊 Columns: {columns}")
             
-            # Save to project data directory
-            project_path = collector.save_to_csv(df, "emails.csv")
+            # Copy to project data directory chunk by chunk
+            project_path = collector.save_csv_in_chunks(file_path, "emails.csv")
             print(f"📁 Copied to project directory: {project_path}")
         else:
             print("❌ File not found!")
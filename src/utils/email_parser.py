@@ -5,68 +5,235 @@ This module provides functions to extract and parse email data from various sour
 It's designed to handle different email formats and extract relevant features for ML.
 """
 
+import os
 import re
+import sys
+import base64
+import quopri
 import email
 from email import policy
+from email.feedparser import FeedParser
 from email import utils as email_utils
-from typing import Dict, List, Optional, Tuple
+from collections import Counter
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 
+from src.preprocessing.html_text import DEFAULT_MAX_HTML_CHARS, html_to_text
+from src.preprocessing.preprocess import TOKEN_CLEANER
+from src.utils import instrumentation
+from src.utils.feature_builder import FEATURE_COLUMNS, FeatureFrameBuilder
+
+if TYPE_CHECKING:
+    from src.utils.parse_cache import ParseCache
+
+
+# Address patterns are compiled once at import time, not per message
+_ANGLE_ADDRESS_RE = re.compile(r'<(.+?)>')
+_EMAIL_ADDRESS_RE = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+
+# Bump whenever extracted features change, so cached parses are invalidated
+PARSER_VERSION = '6'
+
+# Bytes decoded per step when feeding raw bytes to the parser
+_FEED_CHUNK_SIZE = 64 * 1024
+
+# Features returned by the header-only parsing mode
+HEADER_FEATURES = ('subject', 'sender', 'recipients', 'date', 'subject_length', 'sender_domain')
+
+# Common stop words (basic list) ignored by keyword extraction
+STOP_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'})
+
+
+class ParsedEmail(Mapping):
+    """
+    Features of one parsed email, as returned by EmailParser.
+    
+    A slotted record with one attribute per FEATURE_COLUMNS entry, read
+    like the dictionaries the parser used to return: record['subject'],
+    record.get('content'), dict(record) and iteration over keys all work,
+    and filter_label or email_id can be assigned with record[key] = value.
+    Fields that were never set (filter_label and email_id until assigned,
+    the body features of a header-only parse) are missing keys.
+    """
+    
+    __slots__ = tuple(FEATURE_COLUMNS)
+    
+    def __init__(self, **features):
+        for name, value in features.items():
+            setattr(self, name, value)
+    
+    def __getitem__(self, key: str):
+        if key in _RECORD_FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+    
+    def __setitem__(self, key: str, value) -> None:
+        if key not in _RECORD_FIELDS:
+            raise KeyError(f"ParsedEmail has no field {key!r}")
+        setattr(self, key, value)
+    
+    def __contains__(self, key) -> bool:
+        return key in _RECORD_FIELDS and hasattr(self, key)
+    
+    def __iter__(self):
+        return (name for name in self.__slots__ if hasattr(self, name))
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def get(self, key: str, default=None):
+        if key in _RECORD_FIELDS:
+            return getattr(self, key, default)
+        return default
+    
+    def to_dict(self) -> Dict:
+        """Copy the set fields into a plain dictionary."""
+        return {name: getattr(self, name) for name in self}
+    
+    def __repr__(self) -> str:
+        return f"ParsedEmail({self.to_dict()!r})"
+
+
+_RECORD_FIELDS = frozenset(ParsedEmail.__slots__)
+
 
 class EmailParser:
     """Parser for extracting email features for machine learning."""
     
-    def __init__(self):
-        """Initialize the email parser."""
-        self.policy = policy.default
+    def __init__(self, cache: Optional['ParseCache'] = None,
+                 max_body_bytes: Optional[int] = None):
+        """
+        Initialize the email parser.
         
-    def parse_email_content(self, email_content: str) -> Dict:
+        Args:
+            cache: Optional ParseCache (src.utils.parse_cache); messages whose
+                features are cached are not parsed again
+            max_body_bytes: Keep at most this many bytes (UTF-8) of each body
+                in 'content'. 'content_length' is still the length of the
+                full body, so truncated rows have len(content) < content_length;
+                mailbox messages can be re-read in full with
+                src.utils.mailbox_reader.read_full_content
+        """
+        if max_body_bytes is not None and max_body_bytes < 1:
+            raise ValueError("max_body_bytes must be at least 1")
+        
+        self.policy = policy.default
+        self.cache = cache
+        self.max_body_bytes = max_body_bytes
+        self.last_errors: List[Dict] = []
+    
+    def __getstate__(self) -> Dict:
+        """Pickle without the cache, which stays in the owning process."""
+        state = self.__dict__.copy()
+        state['cache'] = None
+        return state
+    
+    @property
+    def version(self) -> str:
+        """Version of the extracted features, used in cache keys."""
+        if self.max_body_bytes is not None:
+            return f"{PARSER_VERSION}:body{self.max_body_bytes}"
+        return PARSER_VERSION
+    
+    def parse_email_content(self, email_content: str, headers_only: bool = False) -> ParsedEmail:
         """
         Parse email content and extract features.
         
         Args:
             email_content: Raw email content as string
+            headers_only: Only parse the header block and return HEADER_FEATURES;
+                the body is never decoded or walked
             
         Returns:
-            Dictionary containing extracted features
+            ParsedEmail with the extracted features (empty if parsing fails)
         """
-        try:
-            # Parse email using email library
-            msg = email.message_from_string(email_content, policy=self.policy)
-            
-            # Extract basic features
-            features = {
-                'subject': self._extract_subject(msg),
-                'sender': self._extract_sender(msg),
-                'recipients': self._extract_recipients(msg),
-                'date': self._extract_date(msg),
-                'content': self._extract_content(msg),
-                'has_attachments': self._has_attachments(msg),
-                'content_length': len(self._extract_content(msg)),
-                'subject_length': len(self._extract_subject(msg)),
-                'sender_domain': self._extract_domain(self._extract_sender(msg))
-            }
+        return self._parse_cached(email_content, email.message_from_string, headers_only)
+    
+    def parse_email_bytes(self, raw_email: Union[bytes, bytearray, memoryview],
+                          headers_only: bool = False) -> ParsedEmail:
+        """
+        Parse raw RFC822 bytes and extract features.
+        
+        Use this for messages read straight from mbox or Maildir sources so
+        they do not have to be decoded to a string first. Buffers (including
+        memoryviews over mmap'd files) are fed to the parser in small chunks,
+        so a multi-MB message is never copied or decoded as a whole.
+        
+        Args:
+            raw_email: Raw email content as bytes, bytearray or memoryview
+            headers_only: Only parse the header block and return HEADER_FEATURES;
+                the body is never decoded or walked
             
-            return features
+        Returns:
+            ParsedEmail with the extracted features (empty if parsing fails)
+        """
+        return self._parse_cached(raw_email, _message_from_buffer, headers_only)
+    
+    def _cache_key(self, raw_email, headers_only: bool = False) -> Optional[str]:
+        """
+        Compute the cache key of a raw message for this parser.
+        
+        The same text parses differently as str and as bytes (8bit bodies
+        are decoded as UTF-8 in one case and as ASCII in the other), so the
+        input kind is part of the version the key is computed with.
+        """
+        version = self.version
+        if not isinstance(raw_email, str):
+            version += ':bytes'
+        if headers_only:
+            version += ':headers'
+        return self.cache.key(raw_email, version)
+    
+    def _parse_cached(self, raw_email, message_factory, headers_only: bool = False) -> ParsedEmail:
+        """Parse a raw message unless its features are already cached."""
+        key = self._cache_key(raw_email, headers_only) if self.cache is not None else None
+        if key is not None:
+            features = self.cache.get(key)
+            if features is not None:
+                recorder = instrumentation.active()
+                if recorder is not None:
+                    recorder.record('parse.cache_hit', items=1, bytes=len(raw_email))
+                return features
+        
+        try:
+            with instrumentation.stage('parse.headers' if headers_only else 'parse') as stage:
+                stage.bytes = len(raw_email)
+                # Parse email using email library
+                if headers_only:
+                    msg = message_factory(_header_block(raw_email), policy=self.policy)
+                    features = self._extract_header_record(msg)
+                else:
+                    msg = message_factory(raw_email, policy=self.policy)
+                    features = self._extract_record(msg)
             
         except Exception as e:
             print(f"Error parsing email: {e}")
-            return {}
+            return ParsedEmail()
+        
+        if key is not None:
+            self.cache.put(key, features)
+        return features
     
     def _extract_subject(self, msg) -> str:
         """Extract email subject."""
         subject = msg.get('subject', '')
-        return subject if subject else 'No Subject'
+        # Plain str: header objects keep their whole parse tree alive
+        return str(subject) if subject else 'No Subject'
     
     def _extract_sender(self, msg) -> str:
-        """Extract sender email address."""
+        """Extract sender email address (interned, as senders repeat across emails)."""
         sender = msg.get('from', '')
         # Extract email from "Name <email@domain.com>" format
-        email_match = re.search(r'<(.+?)>', sender)
+        email_match = _ANGLE_ADDRESS_RE.search(sender)
         if email_match:
-            return email_match.group(1)
-        return sender
+            return sys.intern(email_match.group(1))
+        return sys.intern(str(sender))
     
     def _extract_recipients(self, msg) -> List[str]:
         """Extract recipient email addresses."""
@@ -75,7 +242,7 @@ class EmailParser:
             return []
         
         # Split multiple recipients and clean
-        email_list = re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', recipients)
+        email_list = _EMAIL_ADDRESS_RE.findall(recipients)
         return email_list
     
     def _extract_date(self, msg) -> Optional[datetime]:
@@ -91,84 +258,477 @@ class EmailParser:
         except:
             return None
     
-    def _extract_content(self, msg) -> str:
-        """Extract email body content."""
-        content = ""
+    def _extract_record(self, msg) -> ParsedEmail:
+        """
+        Extract all features from a parsed message.
         
-        if msg.is_multipart():
-            for part in msg.walk():
-                if part.get_content_type() == "text/plain":
-                    content += part.get_content()
-                    break
-        else:
+        Each header is read once and the MIME tree is walked once, so the
+        cost per message does not grow with the number of derived features.
+        
+        Args:
+            msg: Parsed email message
+            
+        Returns:
+            ParsedEmail with all features
+        """
+        subject = self._extract_subject(msg)
+        sender = self._extract_sender(msg)
+        content, attachments = self._walk_parts(msg)
+        content_length = len(content)
+        if self.max_body_bytes is not None:
+            content = _truncate_utf8(content, self.max_body_bytes)
+        
+        return ParsedEmail(
+            subject=subject,
+            sender=sender,
+            recipients=self._extract_recipients(msg),
+            date=self._extract_date(msg),
+            content=content,
+            has_attachments=bool(attachments),
+            content_length=content_length,
+            subject_length=len(subject),
+            sender_domain=self._extract_domain(sender),
+            **self._attachment_features(attachments)
+        )
+    
+    def _extract_header_record(self, msg) -> ParsedEmail:
+        """
+        Extract the features that only need headers (HEADER_FEATURES).
+        
+        Args:
+            msg: Parsed email message (the body may be missing)
+            
+        Returns:
+            ParsedEmail with the header features
+        """
+        subject = self._extract_subject(msg)
+        sender = self._extract_sender(msg)
+        
+        return ParsedEmail(
+            subject=subject,
+            sender=sender,
+            recipients=self._extract_recipients(msg),
+            date=self._extract_date(msg),
+            subject_length=len(subject),
+            sender_domain=self._extract_domain(sender)
+        )
+    
+    def _walk_parts(self, msg) -> Tuple[str, List[Tuple[str, object]]]:
+        """
+        Walk the MIME tree once, collecting body content and attachments.
+        
+        Messages without a text/plain body fall back to the text of their
+        first inline text/html part (src.preprocessing.html_text). Only the
+        body part is decoded; attachments are just collected.
+        
+        Args:
+            msg: Parsed email message
+            
+        Returns:
+            Tuple of (first text/plain body, (filename, part) pairs of every
+            part that has a filename)
+        """
+        if not msg.is_multipart():
+            if msg.get_content_type() == "text/html":
+                return self._html_to_text(msg), []
             content = msg.get_content()
+            return (content if content else ""), []
+        
+        content = None
+        html_part = None
+        attachments = []
+        for part in msg.walk():
+            content_type = part.get_content_type()
+            if content is None and content_type == "text/plain":
+                content = part.get_content()
+            elif (html_part is None and content_type == "text/html"
+                  and part.get_content_disposition() != "attachment"):
+                html_part = part
+            filename = part.get_filename()
+            if filename:
+                attachments.append((filename, part))
+        
+        if content is None and html_part is not None:
+            content = self._html_to_text(html_part)
+        
+        return (content if content else ""), attachments
+    
+    def _attachment_features(self, attachments: List[Tuple[str, object]]) -> Dict:
+        """
+        Summarize attachments from their headers and encoded payloads.
+        
+        Payloads are never decoded: sizes are estimated from the encoded
+        length (see _estimated_size), so a message with large attachments
+        costs about as much as one without.
+        
+        Args:
+            attachments: (filename, part) pairs from _walk_parts
+            
+        Returns:
+            Dictionary with attachment_count, attachment_bytes and the
+            distinct attachment_types and attachment_extensions, comma-joined
+            in order of appearance
+        """
+        if not attachments:
+            return {'attachment_count': 0, 'attachment_bytes': 0,
+                    'attachment_types': '', 'attachment_extensions': ''}
         
-        return content if content else ""
+        types = {}
+        extensions = {}
+        total = 0
+        for filename, part in attachments:
+            types[part.get_content_type()] = None
+            extension = os.path.splitext(str(filename))[1].lstrip('.').lower()
+            if extension:
+                extensions[extension] = None
+            total += _estimated_size(part)
+        
+        # Few distinct combinations exist, so one copy of each is kept
+        return {'attachment_count': len(attachments), 'attachment_bytes': total,
+                'attachment_types': sys.intern(','.join(types)),
+                'attachment_extensions': sys.intern(','.join(extensions))}
     
-    def _has_attachments(self, msg) -> bool:
-        """Check if email has attachments."""
-        if msg.is_multipart():
-            for part in msg.walk():
-                if part.get_filename():
-                    return True
-        return False
+    def _html_to_text(self, part) -> str:
+        """
+        Convert a text/html part to text, up to DEFAULT_MAX_HTML_CHARS of markup.
+        
+        Parts larger than the limit are not decoded as a whole: only the
+        start of the encoded payload is decoded (see _decode_prefix).
+        """
+        payload = part.get_payload()
+        if isinstance(payload, str) and len(payload) > DEFAULT_MAX_HTML_CHARS:
+            markup = _decode_prefix(part, DEFAULT_MAX_HTML_CHARS)
+        else:
+            markup = part.get_content()
+        
+        with instrumentation.stage('parse.html_to_text', bytes=len(markup)):
+            return html_to_text(markup)
     
     def _extract_domain(self, email_address: str) -> str:
-        """Extract domain from email address."""
+        """Extract domain from email address (interned, one copy per domain)."""
         if '@' in email_address:
-            return email_address.split('@')[1]
+            return sys.intern(email_address.split('@')[1])
         return ""
     
-    def extract_features_for_ml(self, email_data: List[Dict]) -> pd.DataFrame:
+    def extract_features_for_ml(self, email_data: List[Dict], n_jobs: int = 1,
+                                chunk_size: int = 1000) -> pd.DataFrame:
         """
         Extract features from multiple emails for ML training.
         
+        With n_jobs > 1 the emails are split into chunks that are parsed in
+        a process pool; rows are returned in input order either way. Emails
+        that fail to parse keep their row (with only filter_label and
+        email_id set) and are reported in self.last_errors. With a cache,
+        only emails whose features are not cached yet are parsed. Records
+        go into the frame builder one round of chunks (chunk_size per
+        worker) at a time, so they are never all held at once.
+        
+        The frame is built column by column (see FeatureFrameBuilder):
+        sender_domain, attachment types and extensions and filter_label are
+        categoricals, lengths and attachment counts and sizes are Int32,
+        date is UTC datetime64 and recipients are comma-joined strings.
+        
         Args:
             email_data: List of dictionaries containing email data
+            n_jobs: Number of worker processes (None or -1 for all CPUs)
+            chunk_size: Number of emails sent to a worker at a time
             
         Returns:
             DataFrame with extracted features
         """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        if n_jobs is None or n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        
+        builder = FeatureFrameBuilder()
+        self.last_errors = []
+        executor = None
+        # Emails are handled in rounds of one chunk per worker; each round is
+        # appended to the builder in input order before the next one starts,
+        # so only one round of parsed records is held outside the builder
+        round_size = chunk_size * max(n_jobs, 1)
+        
+        try:
+            for start in range(0, len(email_data), round_size):
+                records = email_data[start:start + round_size]
+                rows: List[Optional[Dict]] = [None] * len(records)
+                keys: List[Optional[str]] = []
+                if self.cache is not None:
+                    with instrumentation.stage('features.cache_lookup', items=len(records)):
+                        keys = [self._cache_key(record.get('content', '')) for record in records]
+                        rows = self.cache.get_many(keys)
+                
+                # Only messages missing from the cache are parsed
+                pending = [(start + offset, record) for offset, record in enumerate(records)
+                           if rows[offset] is None]
+                chunks = [pending[first:first + chunk_size] for first in range(0, len(pending), chunk_size)]
+                
+                with instrumentation.stage('features.parse', items=len(pending)) as stage:
+                    if instrumentation.active() is not None:
+                        stage.bytes = sum(len(record.get('content') or '') for _, record in pending)
+                    
+                    if n_jobs == 1 or len(chunks) <= 1:
+                        results = (self._extract_chunk(chunk) for chunk in chunks)
+                    else:
+                        if executor is None:
+                            executor = ProcessPoolExecutor(max_workers=n_jobs,
+                                                           initializer=_init_worker,
+                                                           initargs=(self,))
+                        results = executor.map(_extract_worker_chunk, chunks)
+                    
+                    errors_before = len(self.last_errors)
+                    for chunk_features, chunk_errors in results:
+                        failed = {error['index'] for error in chunk_errors}
+                        for index, features in chunk_features:
+                            rows[index - start] = features
+                        if self.cache is not None:
+                            self.cache.put_many([(keys[index - start], features)
+                                                 for index, features in chunk_features
+                                                 if index not in failed])
+                        self.last_errors.extend(chunk_errors)
+                    stage.errors = len(self.last_errors) - errors_before
+                
+                with instrumentation.stage('features.build_frame', items=len(records)):
+                    for record, features in zip(records, rows):
+                        features['filter_label'] = record.get('filter_label', 'unknown')
+                        features['email_id'] = record.get('id', '')
+                    builder.extend(rows)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        with instrumentation.stage('features.build_frame', items=0):
+            return builder.build()
+    
+    def _extract_chunk(self, indexed_records: List[Tuple[int, Dict]]) -> Tuple[List[Tuple[int, Dict]], List[Dict]]:
+        """
+        Extract features from a chunk of emails, collecting parse errors.
+        
+        Args:
+            indexed_records: (position in the full input, email data) pairs
+            
+        Returns:
+            Tuple of ((position, feature dictionary) pairs, error dictionaries)
+        """
         features_list = []
+        errors = []
         
-        for email in email_data:
-            features = self.parse_email_content(email.get('content', ''))
-            features['filter_label'] = email.get('filter_label', 'unknown')
-            features['email_id'] = email.get('id', '')
-            features_list.append(features)
+        for index, record in indexed_records:
+            try:
+                msg = email.message_from_string(record.get('content', ''), policy=self.policy)
+                features = self._extract_record(msg)
+            except Exception as e:
+                features = ParsedEmail()
+                errors.append({
+                    'index': index,
+                    'email_id': record.get('id', ''),
+                    'worker': os.getpid(),
+                    'error': f"{type(e).__name__}: {e}"
+                })
+            features_list.append((index, features))
         
-        return pd.DataFrame(features_list)
+        return features_list, errors
+
+
+def _message_from_buffer(raw_email, policy=policy.compat32):
+    """
+    Parse a message from any bytes-like object, chunk by chunk.
+    
+    Equivalent to email.message_from_bytes, which first decodes the whole
+    message to one string and then copies it into a StringIO. Here each
+    chunk is decoded straight from the buffer (ASCII with surrogateescape,
+    exactly like BytesParser), so no full-size copy is ever made.
+    """
+    parser = FeedParser(policy=policy)
+    with memoryview(raw_email) as view:
+        for start in range(0, len(view), _FEED_CHUNK_SIZE):
+            parser.feed(str(view[start:start + _FEED_CHUNK_SIZE], 'ascii', 'surrogateescape'))
+    return parser.close()
+
+
+def _decode_prefix(part, max_bytes: int) -> str:
+    """
+    Decode at most max_bytes bytes from the start of a text part.
+    
+    Only a prefix of the encoded payload is decoded: base64 is cut to
+    whole 4-character groups and quoted-printable before a trailing,
+    possibly incomplete escape. The bytes are decoded with the part's
+    charset like get_content() does; a character cut at the end is
+    replaced.
+    """
+    payload = part.get_payload()
+    encoding = str(part.get('content-transfer-encoding', '')).strip().lower()
+    if encoding == 'base64':
+        # Two encoded characters per byte leaves room for line breaks
+        chunk = ''.join(payload[:max_bytes * 2].split())
+        data = base64.b64decode(chunk[:len(chunk) - len(chunk) % 4])
+    elif encoding == 'quoted-printable':
+        chunk = payload[:max_bytes * 3]
+        escape = chunk.find('=', len(chunk) - 2)
+        if escape >= 0:
+            chunk = chunk[:escape]
+        data = quopri.decodestring(_payload_bytes(chunk))
+    else:
+        data = _payload_bytes(payload[:max_bytes])
+    
+    data = data[:max_bytes]
+    try:
+        return data.decode(part.get_content_charset('ascii'), 'replace')
+    except LookupError:
+        return data.decode('utf-8', 'replace')
+
+
+def _payload_bytes(payload: str) -> bytes:
+    """
+    Turn a raw payload string back into bytes.
+    
+    Payloads parsed from bytes carry non-ASCII bytes as surrogate escapes;
+    payloads parsed from a str may hold real characters, kept as UTF-8.
+    """
+    try:
+        return payload.encode('ascii', 'surrogateescape')
+    except UnicodeEncodeError:
+        return payload.encode('utf-8', 'surrogateescape')
+
+
+def _estimated_size(part) -> int:
+    """
+    Estimate the decoded size of a MIME part without decoding it.
+    
+    base64 carries three bytes per four characters. Encoders wrap it in
+    lines of equal width, so the line breaks are counted from the width of
+    the first line instead of scanning the payload. Quoted-printable
+    escapes (=XX, and =<newline> soft breaks) count as one byte or none;
+    other encodings are their own size. Container parts, such as attached
+    messages, count as 0.
+    """
+    payload = part.get_payload()
+    if not isinstance(payload, str):
+        return 0
+    
+    encoding = str(part.get('content-transfer-encoding', '')).strip().lower()
+    if encoding == 'base64':
+        tail = payload[-4:].rstrip()
+        length = len(payload) - (len(payload[-4:]) - len(tail))
+        line_end = payload.find('\n', 0, length)
+        if line_end >= 0:
+            line_break = 2 if payload[line_end - 1:line_end] == '\r' else 1
+            # Breaks after every full line, none after the last line
+            length -= (length - 1) // (line_end + 1) * line_break
+        return max(length * 3 // 4 - tail.count('='), 0)
+    if encoding == 'quoted-printable':
+        return max(len(payload) - 2 * payload.count('=') - payload.count('\r'), 0)
+    return len(payload)
+
+
+def _truncate_utf8(text: str, max_bytes: int) -> str:
+    """
+    Cut text to at most max_bytes bytes of UTF-8 without splitting a character.
+    
+    Only a prefix of at most max_bytes characters is ever encoded, so the
+    cost does not depend on the length of the full text.
+    """
+    if len(text) > max_bytes:
+        text = text[:max_bytes]
+    elif text.isascii():
+        return text
+    
+    encoded = text.encode('utf-8', 'surrogatepass')
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode('utf-8', 'ignore')
+
+
+def _header_block(raw_email):
+    """
+    Cut a raw message (str or bytes-like) down to its header block.
+    
+    The header ends at the first empty line, with LF or CRLF line endings;
+    the body after it is never needed for header-only parsing. Buffers are
+    searched window by window and sliced without copying.
+    """
+    if isinstance(raw_email, str):
+        separators = ('\n\n', '\n\r\n')
+    else:
+        separators = (b'\n\n', b'\n\r\n')
+    
+    if isinstance(raw_email, (str, bytes, bytearray)):
+        ends = [position for position in (raw_email.find(separator) for separator in separators)
+                if position >= 0]
+        return raw_email[:min(ends) + 1] if ends else raw_email
+    
+    view = memoryview(raw_email)
+    # Windows overlap by two bytes so a separator split across them is found
+    for start in range(0, len(view), _FEED_CHUNK_SIZE):
+        window = bytes(view[start:start + _FEED_CHUNK_SIZE + 2])
+        ends = [position for position in (window.find(separator) for separator in separators)
+                if position >= 0]
+        if ends:
+            return view[:start + min(ends) + 1]
+    return view
+
+
+# Parser copy owned by each process-pool worker, set by _init_worker
+_worker_parser: Optional[EmailParser] = None
+
+
+def _init_worker(parser: EmailParser) -> None:
+    """Store the parent's parser in a worker process."""
+    global _worker_parser
+    _worker_parser = parser
+
+
+def _extract_worker_chunk(chunk: List[Tuple[int, Dict]]) -> Tuple[List[Tuple[int, Dict]], List[Dict]]:
+    """Extract features from a chunk of (position, email) pairs inside a worker process."""
+    return _worker_parser._extract_chunk(chunk)
 
 
 def clean_text(text: str) -> str:
     """
     Clean and normalize text content.
     
+    Lowercases, turns symbols into word breaks and collapses whitespace.
+    Use TOKEN_CLEANER.clean_batch for a whole Series of texts.
+    
     Args:
         text: Raw text to clean
         
     Returns:
         Cleaned text
     """
-    if not text:
-        return ""
-    
-    # Convert to lowercase
-    text = text.lower()
-    
-    # Remove special characters but keep spaces
-    text = re.sub(r'[^\w\s]', ' ', text)
-    
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    if instrumentation.active() is None:
+        return TOKEN_CLEANER.clean(text)
+    with instrumentation.stage('clean_text.email_parser',
+                               bytes=len(text) if isinstance(text, str) else 0):
+        return TOKEN_CLEANER.clean(text)
+
+
+def keyword_tokens(text: str) -> List[str]:
+    """
+    Split text into keyword candidates.
     
-    return text
+    Args:
+        text: Text to analyze
+        
+    Returns:
+        Cleaned words, without stop words and words of two letters or fewer
+    """
+    return filter_keywords(clean_text(text).split())
+
+
+def filter_keywords(words: List[str]) -> List[str]:
+    """Drop stop words and short words from already cleaned words."""
+    return [word for word in words if word not in STOP_WORDS and len(word) > 2]
 
 
 def extract_keywords(text: str, top_n: int = 10) -> List[str]:
     """
     Extract most common keywords from text.
     
+    For keywords across many emails, use KeywordIndex from
+    src.utils.keyword_index instead of calling this per email.
+    
     Args:
         text: Text to analyze
         top_n: Number of top keywords to return
@@ -176,20 +736,7 @@ def extract_keywords(text: str, top_n: int = 10) -> List[str]:
     Returns:
         List of top keywords
     """
-    from collections import Counter
-    
-    # Clean text
-    cleaned_text = clean_text(text)
-    
-    # Split into words
-    words = cleaned_text.split()
-    
-    # Remove common stop words (basic list)
-    stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
-    words = [word for word in words if word not in stop_words and len(word) > 2]
-    
-    # Count frequency
-    word_counts = Counter(words)
+    word_counts = Counter(keyword_tokens(text))
     
     # Return top N keywords
-    return [word for word, count in word_counts.most_common(top_n)] 
\ No newline at end of file
+    return [word for word, count in word_counts.most_common(top_n)]
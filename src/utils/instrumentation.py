@@ -0,0 +1,275 @@
+"""
+Pipeline Instrumentation
+
+This module records per-stage wall time, call and message counts, bytes
+processed and errors for the collection and parsing pipeline. It is off by
+default: until enable() is called the hooks in EmailParser, clean_text and
+EmailDataCollector cost one global lookup each.
+
+Usage:
+    from src.utils import instrumentation
+    
+    recorder = instrumentation.enable()
+    ...run the pipeline...
+    print(recorder.report())
+    recorder.write_prometheus('outputs/pipeline.prom')
+
+Counts are kept per process; work done inside extract_features_for_ml's
+worker processes is recorded by the parent as one stage.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+DEFAULT_METRIC_PREFIX = 'email_pipeline'
+
+
+class StageStats:
+    """Accumulated measurements of one pipeline stage."""
+    
+    __slots__ = ('calls', 'items', 'bytes', 'errors', 'seconds', 'max_seconds')
+    
+    def __init__(self):
+        self.calls = 0
+        self.items = 0
+        self.bytes = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+    
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _Stage:
+    """Context manager timing one call of a stage."""
+    
+    __slots__ = ('_recorder', 'name', 'items', 'bytes', 'errors', '_start')
+    
+    def __init__(self, recorder: 'Instrumentation', name: str, items: int, bytes: int):
+        self._recorder = recorder
+        self.name = name
+        self.items = items
+        self.bytes = bytes
+        self.errors = 0
+    
+    def __enter__(self) -> '_Stage':
+        self._start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        self._recorder.record(self.name, time.perf_counter() - self._start,
+                              items=self.items, bytes=self.bytes,
+                              errors=self.errors + (1 if exc_type is not None else 0))
+        return False
+
+
+class _NullStage:
+    """Stand-in returned by stage() while instrumentation is disabled."""
+    
+    __slots__ = ('items', 'bytes', 'errors')
+    
+    def __enter__(self) -> '_NullStage':
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Instrumentation:
+    """Thread-safe collection of per-stage measurements."""
+    
+    def __init__(self):
+        self._stages: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+    
+    def stage(self, name: str, items: int = 1, bytes: int = 0) -> _Stage:
+        """
+        Time a block as one call of a stage.
+        
+        The returned object's items, bytes and errors attributes can be
+        updated inside the block when they are only known at the end. An
+        exception leaving the block is counted as an error and re-raised.
+        
+        Args:
+            name: Stage name, such as 'parse' or 'clean_text.preprocess'
+            items: Messages (or texts) handled by the call
+            bytes: Bytes read or written by the call; character count for text
+        """
+        return _Stage(self, name, items, bytes)
+    
+    def record(self, name: str, seconds: float = 0.0, items: int = 0,
+               bytes: int = 0, errors: int = 0) -> None:
+        """Add one call's measurements to a stage."""
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                stats = self._stages[name] = StageStats()
+            stats.calls += 1
+            stats.items += items
+            stats.bytes += bytes
+            stats.errors += errors
+            stats.seconds += seconds
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+    
+    def stats(self) -> Dict[str, Dict]:
+        """Get a snapshot of all stages, keyed by stage name."""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in sorted(self._stages.items())}
+    
+    def reset(self) -> None:
+        """Discard all measurements."""
+        with self._lock:
+            self._stages = {}
+            self.started = time.time()
+    
+    def report(self) -> str:
+        """
+        Format a summary table of all stages.
+        
+        Returns:
+            Multi-line report with time, throughput and errors per stage
+        """
+        stages = self.stats()
+        if not stages:
+            return "📊 Pipeline stages: nothing recorded"
+        
+        lines = ["📊 Pipeline stages",
+                 f"   {'stage':<36} {'calls':>9} {'items':>10} {'seconds':>10} "
+                 f"{'items/s':>11} {'MB':>9} {'errors':>7}"]
+        for name, stats in stages.items():
+            rate = stats['items'] / stats['seconds'] if stats['seconds'] else 0.0
+            lines.append(f"   {name:<36} {stats['calls']:>9,} {stats['items']:>10,} "
+                         f"{stats['seconds']:>10.3f} {rate:>11,.0f} "
+                         f"{stats['bytes'] / 1024 ** 2:>9,.1f} {stats['errors']:>7,}")
+        return '\n'.join(lines)
+    
+    def to_prometheus(self, prefix: str = DEFAULT_METRIC_PREFIX) -> str:
+        """
+        Format all stages in the Prometheus text exposition format.
+        
+        Args:
+            prefix: Metric name prefix
+        
+        Returns:
+            Metrics text, one series per stage and measurement
+        """
+        stages = self.stats()
+        metrics = [
+            ('stage_seconds_total', 'counter', 'Wall time spent in the stage.', 'seconds'),
+            ('stage_calls_total', 'counter', 'Number of calls of the stage.', 'calls'),
+            ('stage_items_total', 'counter', 'Messages or texts handled by the stage.', 'items'),
+            ('stage_bytes_total', 'counter', 'Bytes read or written by the stage (characters for text).', 'bytes'),
+            ('stage_errors_total', 'counter', 'Failed calls or messages in the stage.', 'errors'),
+            ('stage_max_seconds', 'gauge', 'Longest single call of the stage.', 'max_seconds'),
+        ]
+        
+        lines = []
+        for suffix, metric_type, help_text, field in metrics:
+            name = f"{prefix}_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for stage, stats in stages.items():
+                label = stage.replace('\\', '\\\\').replace('"', '\\"')
+                lines.append(f'{name}{{stage="{label}"}} {stats[field]}')
+        lines.append(f"# HELP {prefix}_started_timestamp_seconds When recording started.")
+        lines.append(f"# TYPE {prefix}_started_timestamp_seconds gauge")
+        lines.append(f"{prefix}_started_timestamp_seconds {self.started}")
+        return '\n'.join(lines) + '\n'
+    
+    def write_prometheus(self, path: str, prefix: str = DEFAULT_METRIC_PREFIX) -> str:
+        """
+        Write the Prometheus metrics to a file atomically.
+        
+        The file can be picked up by node_exporter's textfile collector,
+        which must never see a half-written file.
+        
+        Args:
+            path: Output file, conventionally ending in .prom
+            prefix: Metric name prefix
+        
+        Returns:
+            Path to the written file
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus(prefix))
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return path
+
+
+_active: Optional[Instrumentation] = None
+
+
+def enable(recorder: Optional[Instrumentation] = None) -> Instrumentation:
+    """
+    Turn instrumentation on for this process.
+    
+    Args:
+        recorder: Instrumentation to record into (a new one by default)
+    
+    Returns:
+        The active Instrumentation
+    """
+    global _active
+    _active = recorder or Instrumentation()
+    return _active
+
+
+def disable() -> None:
+    """Turn instrumentation off; recorded measurements stay in the recorder."""
+    global _active
+    _active = None
+
+
+def active() -> Optional[Instrumentation]:
+    """Get the active Instrumentation, or None when disabled."""
+    return _active
+
+
+def stage(name: str, items: int = 1, bytes: int = 0):
+    """
+    Time a block on the active Instrumentation, if any.
+    
+    Returns a no-op context manager while instrumentation is disabled;
+    see Instrumentation.stage for the arguments.
+    """
+    recorder = _active
+    if recorder is None:
+        return _NULL_STAGE
+    return _Stage(recorder, name, items, bytes)
+
+
+@contextmanager
+def instrumented(recorder: Optional[Instrumentation] = None) -> Iterator[Instrumentation]:
+    """
+    Enable instrumentation for the duration of a block.
+    
+    Yields:
+        The Instrumentation recording the block
+    """
+    global _active
+    previous = _active
+    current = enable(recorder)
+    try:
+        yield current
+    finally:
+        _active = previous
@@ -0,0 +1,223 @@
+"""
+Keyword Index
+
+This module keeps running term frequencies per filter label and across
+all emails, so top keywords can be queried at any time without
+rescanning old messages.
+"""
+
+import heapq
+import json
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from src.preprocessing.preprocess import TOKEN_CLEANER
+from src.utils.email_parser import filter_keywords, keyword_tokens
+
+
+class _TermCounts:
+    """Term frequencies plus an incrementally maintained top-K set."""
+    
+    __slots__ = ('counts', 'capacity', '_top', '_floor', '_ranked')
+    
+    def __init__(self, capacity: int):
+        self.counts: Dict[str, int] = {}
+        self.capacity = capacity
+        self._top: Dict[str, int] = {}
+        self._floor = 0
+        self._ranked: Optional[List[Tuple[str, int]]] = None
+    
+    def add(self, term_counts: Dict[str, int]) -> None:
+        """Add term counts and keep the top-K set current."""
+        counts = self.counts
+        top = self._top
+        
+        for term, n in term_counts.items():
+            count = counts.get(term, 0) + n
+            counts[term] = count
+            
+            # Counts only grow, so a term can only enter the top-K set by
+            # overtaking its current minimum (the floor)
+            if term in top:
+                at_floor = top[term] == self._floor
+                top[term] = count
+                if at_floor:
+                    self._floor = min(top.values())
+            elif len(top) < self.capacity:
+                top[term] = count
+                self._floor = min(self._floor, count) if len(top) > 1 else count
+            elif count > self._floor:
+                del top[min(top, key=top.get)]
+                top[term] = count
+                self._floor = min(top.values())
+            else:
+                continue
+            self._ranked = None
+    
+    def most_common(self, top_n: int) -> List[Tuple[str, int]]:
+        """Return the top_n (term, count) pairs, highest count first."""
+        if top_n > self.capacity:
+            return sorted(heapq.nlargest(top_n, self.counts.items(), key=itemgetter(1)), key=_rank_key)
+        if self._ranked is None:
+            self._ranked = sorted(self._top.items(), key=_rank_key)
+        return self._ranked[:top_n]
+    
+    def rebuild_top(self) -> None:
+        """Recompute the top-K set from the full counts."""
+        self._top = dict(heapq.nlargest(self.capacity, self.counts.items(), key=itemgetter(1)))
+        self._floor = min(self._top.values()) if self._top else 0
+        self._ranked = None
+
+
+def _rank_key(item: Tuple[str, int]):
+    """Sort by count descending, then alphabetically."""
+    return -item[1], item[0]
+
+
+class KeywordIndex:
+    """Incremental term-frequency index per filter label and across all emails."""
+    
+    def __init__(self, top_k: int = 100):
+        """
+        Initialize an empty index.
+        
+        Args:
+            top_k: Number of top terms kept ready per label; queries for up
+                to this many keywords are answered without scanning counts
+        """
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1")
+        
+        self.top_k = top_k
+        self.email_counts: Dict[str, int] = {}
+        self._labels: Dict[str, _TermCounts] = {}
+        self._global = _TermCounts(top_k)
+    
+    @property
+    def labels(self) -> List[str]:
+        """Labels that have at least one indexed email."""
+        return list(self._labels)
+    
+    def add(self, text: str, label: str = 'unknown') -> None:
+        """
+        Index one email's text.
+        
+        Args:
+            text: Text to index (e.g. subject and content)
+            label: Filter label of the email
+        """
+        self._add_words(keyword_tokens(text), label)
+    
+    def add_many(self, texts: Iterable[str], labels: Iterable[str]) -> None:
+        """
+        Index many emails, cleaning their texts as one batch.
+        
+        Args:
+            texts: Texts to index
+            labels: Filter label of each text
+        """
+        cleaned = TOKEN_CLEANER.clean_batch(list(texts))
+        for text, label in zip(cleaned, labels):
+            self._add_words(filter_keywords(text.split()), label)
+    
+    def add_frame(self, df: pd.DataFrame, text_column: str = 'content',
+                  label_column: str = 'filter_label') -> None:
+        """
+        Index the emails in a DataFrame.
+        
+        Args:
+            df: DataFrame with text and label columns
+            text_column: Column with the text to index
+            label_column: Column with the filter label
+        """
+        self.add_many(df[text_column], df[label_column].astype(str))
+    
+    def _add_words(self, words: List[str], label: str) -> None:
+        """Update the label and global counts with one email's words."""
+        term_counts = Counter(words)
+        
+        counts = self._labels.get(label)
+        if counts is None:
+            counts = self._labels[label] = _TermCounts(self.top_k)
+        counts.add(term_counts)
+        self._global.add(term_counts)
+        self.email_counts[label] = self.email_counts.get(label, 0) + 1
+    
+    def top_keywords(self, label: Optional[str] = None, top_n: int = 10) -> List[str]:
+        """
+        Get the most frequent keywords.
+        
+        Args:
+            label: Filter label to query (None for all emails)
+            top_n: Number of keywords to return
+            
+        Returns:
+            List of keywords, most frequent first
+        """
+        return [term for term, count in self.top_keywords_with_counts(label, top_n)]
+    
+    def top_keywords_with_counts(self, label: Optional[str] = None,
+                                 top_n: int = 10) -> List[Tuple[str, int]]:
+        """
+        Get the most frequent keywords with their counts.
+        
+        Args:
+            label: Filter label to query (None for all emails)
+            top_n: Number of keywords to return
+            
+        Returns:
+            List of (keyword, count) pairs, most frequent first
+        """
+        counts = self._global if label is None else self._labels.get(label)
+        if counts is None:
+            return []
+        return counts.most_common(top_n)
+    
+    def save(self, path: str) -> str:
+        """
+        Save the index to a JSON file.
+        
+        Args:
+            path: Output file path
+            
+        Returns:
+            Path to the saved file
+        """
+        state = {
+            'top_k': self.top_k,
+            'email_counts': self.email_counts,
+            'term_counts': {label: counts.counts for label, counts in self._labels.items()}
+        }
+        with open(path, 'w') as f:
+            json.dump(state, f)
+        return path
+    
+    @classmethod
+    def load(cls, path: str) -> 'KeywordIndex':
+        """
+        Load an index saved with save().
+        
+        Args:
+            path: Path to the JSON file
+            
+        Returns:
+            KeywordIndex ready for queries and further updates
+        """
+        with open(path) as f:
+            state = json.load(f)
+        
+        index = cls(top_k=state['top_k'])
+        index.email_counts = state['email_counts']
+        global_counts = Counter()
+        for label, term_counts in state['term_counts'].items():
+            counts = index._labels[label] = _TermCounts(index.top_k)
+            counts.counts = term_counts
+            counts.rebuild_top()
+            global_counts.update(term_counts)
+        
+        index._global.counts = dict(global_counts)
+        index._global.rebuild_top()
+        return index
@@ -0,0 +1,204 @@
+"""
+Local IMAP Stand-in Server
+
+A small asyncio IMAP4rev1 server that serves messages from memory. It
+implements just the commands IMAPFetcher uses (CAPABILITY, LOGIN, SELECT,
+EXAMINE, UID SEARCH, UID FETCH, NOOP, LOGOUT) and answers pipelined
+commands in order, so the fetcher can be exercised without a real account.
+"""
+
+import asyncio
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.utils.mailbox_reader import iter_mailbox
+
+
+_COMMAND_RE = re.compile(r'^(\S+) (.*)$')
+_ARGUMENT_RE = re.compile(r'"((?:[^"\\]|\\.)*)"|(\S+)')
+_ESCAPE_RE = re.compile(r'\\(.)')
+
+
+def _unquote(value: str) -> str:
+    """Undo the backslash escapes of an IMAP quoted string."""
+    return _ESCAPE_RE.sub(r'\1', value)
+
+
+class LocalIMAPServer:
+    """In-memory IMAP server listening on localhost."""
+    
+    def __init__(self, messages: Iterable[bytes] = (), mailbox: str = 'INBOX',
+                 username: str = 'user', password: str = 'password',
+                 uidvalidity: int = 1, host: str = '127.0.0.1', port: int = 0):
+        """
+        Initialize the server.
+        
+        Args:
+            messages: Raw RFC822 messages for the mailbox, in UID order
+            mailbox: Name of the served mailbox
+            username: Accepted login user name
+            password: Accepted login password
+            uidvalidity: UIDVALIDITY reported for the mailbox
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+        """
+        self.mailbox = mailbox
+        self.username = username
+        self.password = password
+        self.uidvalidity = uidvalidity
+        self.host = host
+        self.port = port
+        self.messages: List[Tuple[int, bytes]] = []
+        self.fetch_commands = 0
+        self._next_uid = 1
+        self._server: Optional[asyncio.base_events.Server] = None
+        for raw_email in messages:
+            self.add_message(raw_email)
+    
+    @classmethod
+    def from_mailbox(cls, path: str, **kwargs) -> 'LocalIMAPServer':
+        """Create a server that serves the messages of an mbox file or Maildir."""
+        return cls((bytes(raw_email) for _, raw_email in iter_mailbox(path)), **kwargs)
+    
+    def add_message(self, raw_email: bytes) -> int:
+        """
+        Append a message, as if new mail had arrived.
+        
+        Args:
+            raw_email: Raw RFC822 message
+            
+        Returns:
+            UID assigned to the message
+        """
+        uid = self._next_uid
+        self._next_uid += 1
+        self.messages.append((uid, raw_email))
+        return uid
+    
+    def reset_uidvalidity(self, uidvalidity: int) -> None:
+        """Change UIDVALIDITY, as a server does when it renumbers a mailbox."""
+        self.uidvalidity = uidvalidity
+    
+    async def start(self) -> 'LocalIMAPServer':
+        """Start listening; the chosen port is available as self.port."""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+    
+    async def stop(self) -> None:
+        """Stop listening and wait for the server to close."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+    
+    async def __aenter__(self) -> 'LocalIMAPServer':
+        return await self.start()
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+    
+    async def _handle_client(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter) -> None:
+        """Serve one client connection."""
+        state = {'authenticated': False, 'selected': False}
+        writer.write(b'* OK [CAPABILITY IMAP4rev1] Local IMAP stand-in ready\r\n')
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                match = _COMMAND_RE.match(line.decode('utf-8', 'replace').rstrip('\r\n'))
+                if match is None:
+                    writer.write(b'* BAD Malformed command\r\n')
+                    continue
+                tag, rest = match.groups()
+                arguments = [_unquote(m.group(1)) if m.group(1) is not None else m.group(2)
+                             for m in _ARGUMENT_RE.finditer(rest)]
+                
+                keep_open = self._dispatch(tag, arguments, state, writer)
+                await writer.drain()
+                if not keep_open:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    
+    def _dispatch(self, tag: str, arguments: List[str], state: Dict,
+                  writer: asyncio.StreamWriter) -> bool:
+        """Execute one command; returns False when the connection should close."""
+        command = arguments[0].upper() if arguments else ''
+        if command == 'UID' and len(arguments) > 1:
+            command = 'UID ' + arguments[1].upper()
+            arguments = arguments[1:]
+        
+        def reply(status: str, text: str) -> None:
+            writer.write(f"{tag} {status} {text}\r\n".encode('utf-8'))
+        
+        if command == 'CAPABILITY':
+            writer.write(b'* CAPABILITY IMAP4rev1\r\n')
+            reply('OK', 'CAPABILITY completed')
+        elif command == 'NOOP':
+            reply('OK', 'NOOP completed')
+        elif command == 'LOGOUT':
+            writer.write(b'* BYE Logging out\r\n')
+            reply('OK', 'LOGOUT completed')
+            return False
+        elif command == 'LOGIN':
+            if arguments[1:3] == [self.username, self.password]:
+                state['authenticated'] = True
+                reply('OK', 'LOGIN completed')
+            else:
+                reply('NO', '[AUTHENTICATIONFAILED] Invalid credentials')
+        elif not state['authenticated']:
+            reply('BAD', 'Not authenticated')
+        elif command in ('SELECT', 'EXAMINE'):
+            if len(arguments) < 2 or arguments[1] != self.mailbox:
+                reply('NO', 'No such mailbox')
+                return True
+            state['selected'] = True
+            writer.write(f"* {len(self.messages)} EXISTS\r\n"
+                         f"* OK [UIDVALIDITY {self.uidvalidity}] UIDs valid\r\n"
+                         f"* OK [UIDNEXT {self._next_uid}] Predicted next UID\r\n"
+                         .encode('ascii'))
+            mode = 'READ-ONLY' if command == 'EXAMINE' else 'READ-WRITE'
+            reply('OK', f"[{mode}] {command} completed")
+        elif not state['selected']:
+            reply('BAD', 'No mailbox selected')
+        elif command == 'UID SEARCH':
+            criteria = [argument.upper() for argument in arguments[1:]]
+            if criteria == ['ALL']:
+                uids = [uid for uid, _ in self.messages]
+            elif len(criteria) == 2 and criteria[0] == 'UID':
+                uids = self._match_uids(criteria[1])
+            else:
+                reply('BAD', 'Unsupported search criteria')
+                return True
+            writer.write(('* SEARCH' + ''.join(f" {uid}" for uid in uids) + '\r\n').encode('ascii'))
+            reply('OK', 'UID SEARCH completed')
+        elif command == 'UID FETCH' and len(arguments) >= 3:
+            self.fetch_commands += 1
+            wanted = set(self._match_uids(arguments[1]))
+            for sequence, (uid, raw_email) in enumerate(self.messages, start=1):
+                if uid in wanted:
+                    writer.write(f"* {sequence} FETCH (UID {uid} BODY[] {{{len(raw_email)}}}\r\n"
+                                 .encode('ascii'))
+                    writer.write(raw_email)
+                    writer.write(b')\r\n')
+            reply('OK', 'UID FETCH completed')
+        else:
+            reply('BAD', 'Unsupported command')
+        return True
+    
+    def _match_uids(self, uid_set: str) -> List[int]:
+        """Resolve an IMAP UID set such as "1:4,7,9:*" against the mailbox."""
+        highest = self.messages[-1][0] if self.messages else 0
+        ranges = []
+        for part in uid_set.split(','):
+            first, _, last = part.partition(':')
+            low = highest if first == '*' else int(first)
+            high = low if not last else (highest if last == '*' else int(last))
+            ranges.append((min(low, high), max(low, high)))
+        return [uid for uid, _ in self.messages
+                if any(low <= uid <= high for low, high in ranges)]
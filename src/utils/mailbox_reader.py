@@ -0,0 +1,422 @@
+"""
+Mailbox Reader Utilities
+
+This module streams messages out of mbox files and Maildir directories.
+Messages are read one at a time and parsed in bounded batches, so multi-GB
+exports such as Gmail Takeout can be processed in constant memory.
+"""
+
+import hashlib
+import mmap
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.utils.email_parser import EmailParser
+from src.utils.sync_state import SyncStateStore, mailbox_source_id
+
+
+DEFAULT_BATCH_SIZE = 500
+
+MAILDIR_SUBDIRS = ('new', 'cur')
+
+
+def is_maildir(path: str) -> bool:
+    """Check whether a path is a Maildir directory."""
+    return os.path.isdir(path) and all(
+        os.path.isdir(os.path.join(path, subdir)) for subdir in MAILDIR_SUBDIRS
+    )
+
+
+def iter_mbox(path: str, after: Optional[int] = None) -> Iterator[Tuple[str, bytes]]:
+    """
+    Stream raw messages from an mbox file.
+    
+    A message starts at a "From " envelope line that is either the first
+    line of the file or follows a blank line. Only the current message is
+    held in memory.
+    
+    Args:
+        path: Path to the mbox file
+        after: Only yield messages after the one whose envelope line starts
+            at this offset (a key from an earlier run)
+        
+    Yields:
+        Tuples of (message key, raw message bytes); the key is the byte
+        offset of the message's envelope line
+    """
+    with open(path, 'rb') as f:
+        lines: List[bytes] = []
+        start = None
+        offset = 0
+        previous_blank = True
+        if after is not None:
+            f.seek(after)
+            offset = after
+            previous_blank = False
+        
+        for line in f:
+            if previous_blank and line.startswith(b'From '):
+                if start is not None:
+                    yield str(start), _join_mbox_lines(lines)
+                lines = []
+                start = offset
+            elif start is not None:
+                lines.append(line)
+            offset += len(line)
+            previous_blank = line in (b'\n', b'\r\n')
+        
+        if start is not None:
+            yield str(start), _join_mbox_lines(lines)
+
+
+def iter_mbox_views(path: str, after: Optional[int] = None) -> Iterator[Tuple[str, memoryview]]:
+    """
+    Stream messages from an mbox file as zero-copy views into a memory map.
+    
+    Messages are split with the same rules as iter_mbox, but each one is a
+    memoryview slice of the mapped file, so no message bytes are copied
+    until the parser reads them. A view is only valid until the next
+    message is requested; copy it with bytes() to keep it longer.
+    
+    Args:
+        path: Path to the mbox file
+        after: Only yield messages after the one whose envelope line starts
+            at this offset (see iter_mbox)
+        
+    Yields:
+        Tuples of (message key, memoryview of the raw message)
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if after is not None:
+                start = _next_mbox_envelope(mapped, after)
+            else:
+                start = 0 if mapped[:5] == b'From ' else _next_mbox_envelope(mapped, 0)
+            
+            while start is not None:
+                span = _mbox_message_span(mapped, start)
+                if span is None:
+                    break
+                body_start, end, next_start = span
+                
+                view = memoryview(mapped)[body_start:end]
+                try:
+                    yield str(start), view
+                finally:
+                    view.release()
+                start = next_start
+
+
+def _mbox_message_span(mapped: mmap.mmap, start: int) -> Optional[Tuple[int, int, Optional[int]]]:
+    """
+    Locate the message whose envelope line starts at an offset.
+    
+    Returns:
+        Tuple of (offset after the envelope line, end of the message,
+        offset of the next envelope or None), or None if the envelope
+        line is not terminated
+    """
+    body_start = mapped.find(b'\n', start)
+    if body_start < 0:
+        return None
+    body_start += 1
+    
+    next_start = _next_mbox_envelope(mapped, body_start - 1)
+    end = len(mapped) if next_start is None else next_start
+    # Drop the blank separator line before the next message
+    if mapped[end - 2:end] == b'\n\n':
+        end -= 1
+    elif mapped[end - 3:end] == b'\n\r\n':
+        end -= 2
+    return body_start, max(end, body_start), next_start
+
+
+def _next_mbox_envelope(mapped: mmap.mmap, position: int) -> Optional[int]:
+    """Find the next "From " line that follows a blank line."""
+    candidates = [found + offset for found, offset in
+                  ((mapped.find(b'\n\nFrom ', position), 2),
+                   (mapped.find(b'\n\r\nFrom ', position), 3))
+                  if found >= 0]
+    return min(candidates) if candidates else None
+
+
+def _join_mbox_lines(lines: List[bytes]) -> bytes:
+    """Join message lines, dropping the blank separator before the next message."""
+    if lines and lines[-1] in (b'\n', b'\r\n'):
+        lines = lines[:-1]
+    return b''.join(lines)
+
+
+def iter_maildir(path: str) -> Iterator[Tuple[str, bytes]]:
+    """
+    Stream raw messages from a Maildir directory.
+    
+    Args:
+        path: Path to the Maildir (the directory containing new/ and cur/)
+        
+    Yields:
+        Tuples of (message key, raw message bytes); the key is the unique
+        Maildir name without its flags suffix
+    """
+    for key, file_path, _ in _maildir_entries(path):
+        with open(file_path, 'rb') as f:
+            yield key, f.read()
+
+
+def _maildir_entries(path: str) -> Iterator[Tuple[str, str, int]]:
+    """List Maildir messages as (key, file path, mtime in ns), new/ before cur/."""
+    for subdir in MAILDIR_SUBDIRS:
+        folder = os.path.join(path, subdir)
+        if not os.path.isdir(folder):
+            continue
+        
+        for entry in sorted(os.scandir(folder), key=lambda entry: entry.name):
+            if entry.name.startswith('.') or not entry.is_file():
+                continue
+            yield entry.name.split(':', 1)[0], entry.path, entry.stat().st_mtime_ns
+
+
+class MailboxCursor:
+    """
+    Resumable read position in an mbox file or Maildir directory.
+    
+    An mbox position is the offset of the last message read, checked
+    against a digest of its envelope line and the file size so that a
+    rewritten or truncated file is re-read from the start. A Maildir
+    position is the newest file modification time read, plus the keys
+    read at exactly that time; new messages are read in mtime order.
+    Maildir deliveries that carry an older mtime than the position (for
+    example files copied with their timestamps preserved) are not seen.
+    """
+    
+    def __init__(self, path: str, state: Optional[Dict] = None):
+        """
+        Initialize the cursor.
+        
+        Args:
+            path: Path to an mbox file or Maildir directory
+            state: Position saved by checkpoint() in an earlier run, or
+                None to start from the beginning
+        """
+        if is_maildir(path):
+            self.kind = 'maildir'
+        elif os.path.isfile(path):
+            self.kind = 'mbox'
+        else:
+            raise FileNotFoundError(f"No mbox file or Maildir directory at {path}")
+        
+        self.path = path
+        self._state = state if state and self._is_current(state) else None
+        self.resumed = self._state is not None
+        self._offset = self._state['offset'] if self.kind == 'mbox' and self._state else None
+        self._mtime_ns = self._state['mtime_ns'] if self.kind == 'maildir' and self._state else None
+        self._seen = set(self._state['seen']) if self.kind == 'maildir' and self._state else set()
+    
+    def _is_current(self, state: Dict) -> bool:
+        """Check that a saved position still matches the mailbox."""
+        if state.get('kind') != self.kind:
+            return False
+        if self.kind == 'maildir':
+            return True
+        return (os.path.getsize(self.path) >= state['size'] and
+                _mbox_envelope_digest(self.path, state['offset']) == state['envelope'])
+    
+    def messages(self, zero_copy: bool = False) -> Iterator[Tuple[str, bytes]]:
+        """
+        Stream the messages after the cursor, advancing it as they are read.
+        
+        Args:
+            zero_copy: Yield mbox messages as memoryviews (see iter_mbox_views)
+            
+        Yields:
+            Tuples of (message key, raw message bytes or memoryview)
+        """
+        if self.kind == 'mbox':
+            reader = iter_mbox_views if zero_copy else iter_mbox
+            for key, raw_email in reader(self.path, after=self._offset):
+                self._offset = int(key)
+                yield key, raw_email
+            return
+        
+        entries = [(mtime_ns, key, file_path)
+                   for key, file_path, mtime_ns in _maildir_entries(self.path)
+                   if self._mtime_ns is None or mtime_ns > self._mtime_ns or
+                   (mtime_ns == self._mtime_ns and key not in self._seen)]
+        entries.sort()
+        
+        for mtime_ns, key, file_path in entries:
+            with open(file_path, 'rb') as f:
+                raw_email = f.read()
+            if mtime_ns != self._mtime_ns:
+                self._mtime_ns = mtime_ns
+                self._seen = set()
+            self._seen.add(key)
+            yield key, raw_email
+    
+    def checkpoint(self) -> Optional[Dict]:
+        """
+        Get the position covering every message read so far.
+        
+        Returns:
+            JSON-serializable position for a later MailboxCursor, or None if
+            nothing has been read yet
+        """
+        if self.kind == 'mbox':
+            if self._offset is None:
+                return None
+            return {'kind': 'mbox', 'offset': self._offset,
+                    'envelope': _mbox_envelope_digest(self.path, self._offset),
+                    'size': os.path.getsize(self.path)}
+        
+        if self._mtime_ns is None:
+            return None
+        return {'kind': 'maildir', 'mtime_ns': self._mtime_ns, 'seen': sorted(self._seen)}
+
+
+def _mbox_envelope_digest(path: str, offset: int) -> Optional[str]:
+    """Digest of the envelope line at an offset, or None if there is none."""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        line = f.readline()
+    if not line.startswith(b'From '):
+        return None
+    return hashlib.blake2b(line, digest_size=16).hexdigest()
+
+
+def read_message(path: str, key: str) -> bytes:
+    """
+    Read one message back from its mailbox.
+    
+    Mbox keys are byte offsets of envelope lines, so only that message is
+    read from the file; Maildir keys are looked up in new/ and cur/.
+    
+    Args:
+        path: Path to the mbox file or Maildir directory the key came from
+        key: Message key yielded by iter_mailbox (or the last part of an
+            email_id from iter_feature_batches)
+        
+    Returns:
+        Raw message bytes, as iter_mailbox yielded them
+        
+    Raises:
+        KeyError: If there is no message with that key
+    """
+    if is_maildir(path):
+        for entry_key, entry_path, _ in _maildir_entries(path):
+            if entry_key == key:
+                with open(entry_path, 'rb') as f:
+                    return f.read()
+        raise KeyError(key)
+    
+    try:
+        offset = int(key)
+    except ValueError:
+        raise KeyError(key) from None
+    
+    with open(path, 'rb') as f:
+        if not 0 <= offset < os.fstat(f.fileno()).st_size:
+            raise KeyError(key)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            span = _mbox_message_span(mapped, offset) if mapped[offset:offset + 5] == b'From ' else None
+            if span is None:
+                raise KeyError(key)
+            body_start, end, _ = span
+            return mapped[body_start:end]
+
+
+def read_full_content(path: str, email_id: str) -> str:
+    """
+    Get the complete body of a mailbox message.
+    
+    Feature records built with EmailParser(max_body_bytes=...) keep only
+    the start of long bodies; this re-reads the message from its source
+    and parses it without a limit.
+    
+    Args:
+        path: Path to the mbox file or Maildir directory the email came from
+        email_id: email_id from iter_feature_batches ("<source>:<key>") or
+            a bare message key
+        
+    Returns:
+        Full body content, as in the 'content' feature
+    """
+    key = email_id.rsplit(':', 1)[-1]
+    return EmailParser().parse_email_bytes(read_message(path, key)).get('content', '')
+
+
+def iter_mailbox(path: str, zero_copy: bool = False) -> Iterator[Tuple[str, bytes]]:
+    """
+    Stream raw messages from an mbox file or a Maildir directory.
+    
+    Args:
+        path: Path to the mailbox
+        zero_copy: Yield mbox messages as memoryviews (see iter_mbox_views)
+        
+    Yields:
+        Tuples of (message key, raw message bytes or memoryview)
+    """
+    if is_maildir(path):
+        return iter_maildir(path)
+    if os.path.isfile(path):
+        return iter_mbox_views(path) if zero_copy else iter_mbox(path)
+    raise FileNotFoundError(f"No mbox file or Maildir directory at {path}")
+
+
+def iter_feature_batches(path: str,
+                         parser: Optional[EmailParser] = None,
+                         batch_size: int = DEFAULT_BATCH_SIZE,
+                         label: str = 'unknown',
+                         headers_only: bool = False,
+                         sync_state: Optional[SyncStateStore] = None) -> Iterator[List[Dict]]:
+    """
+    Parse a mailbox into feature records, yielded in bounded batches.
+    
+    With a sync_state store only messages that arrived since the last
+    synced run are parsed. The stored position advances past a batch when
+    the next one is requested (or the mailbox is exhausted), so a batch
+    whose processing raised is read again on the next run.
+    
+    Args:
+        path: Path to an mbox file or Maildir directory
+        parser: Parser to use (a new EmailParser by default)
+        batch_size: Maximum number of records per batch
+        label: Filter label assigned to every message from this source
+        headers_only: Only parse headers (see EmailParser.parse_email_bytes)
+        sync_state: Store to resume from and record progress in
+        
+    Yields:
+        Lists of at most batch_size feature dictionaries
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    
+    parser = parser or EmailParser()
+    source = os.path.basename(os.path.normpath(path))
+    source_id = mailbox_source_id(path)
+    cursor = MailboxCursor(path, sync_state.get(source_id) if sync_state else None)
+    batch = []
+    
+    def commit():
+        position = cursor.checkpoint()
+        if sync_state is not None and position is not None:
+            sync_state.set(source_id, position)
+            sync_state.save()
+    
+    for key, raw_email in cursor.messages(zero_copy=True):
+        features = parser.parse_email_bytes(raw_email, headers_only=headers_only)
+        if not features:
+            continue
+        features['filter_label'] = label
+        features['email_id'] = f"{source}:{key}"
+        batch.append(features)
+        
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+            commit()
+    
+    if batch:
+        yield batch
+    commit()
@@ -0,0 +1,209 @@
+"""
+Parse Cache
+
+This module stores parsed email features on disk, keyed by a hash of the
+raw message and the parser version. Re-running feature extraction over
+the same messages then skips parsing for everything that has not changed.
+Entries are evicted least-recently-used first once the cache grows past
+its size limit.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+
+# SQLite's limit on parameters per statement is 999 on older builds
+_SQL_BATCH = 500
+
+
+class ParseCache:
+    """SQLite-backed LRU cache of parsed email features."""
+    
+    def __init__(self, path: str, max_bytes: int = 1024 ** 3):
+        """
+        Open (or create) a cache file.
+        
+        Args:
+            path: Path to the SQLite cache file
+            max_bytes: Size limit for stored features before eviction
+        """
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS parsed ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS parsed_last_used ON parsed (last_used)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM parsed").fetchone()[0]
+    
+    def __enter__(self) -> 'ParseCache':
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM parsed").fetchone()[0]
+    
+    def key(self, raw_email: Union[str, bytes], parser_version: str) -> Optional[str]:
+        """
+        Compute the cache key of a raw message.
+        
+        Args:
+            raw_email: Raw email content as string or bytes
+            parser_version: Version of the parser and its settings; entries
+                written under another version are never returned
+            
+        Returns:
+            Hex digest of the parser version and message, or None for
+            values that are not messages (which are never cached)
+        """
+        if isinstance(raw_email, str):
+            raw_email = raw_email.encode('utf-8', 'surrogatepass')
+        elif not isinstance(raw_email, (bytes, bytearray, memoryview)):
+            return None
+        
+        digest = hashlib.blake2b(parser_version.encode('utf-8'), digest_size=20)
+        digest.update(b'\0')
+        digest.update(raw_email)
+        return digest.hexdigest()
+    
+    def get(self, key: Optional[str]) -> Optional[Dict]:
+        """Get the cached features for a key, or None on a miss."""
+        return self.get_many([key])[0]
+    
+    def get_many(self, keys: Sequence[Optional[str]]) -> List[Optional[Dict]]:
+        """
+        Look up several keys at once.
+        
+        Args:
+            keys: Cache keys (None entries always miss)
+            
+        Returns:
+            Cached features per key, None for misses
+        """
+        wanted = list({key for key in keys if key is not None})
+        found: Dict[str, Dict] = {}
+        
+        for start in range(0, len(wanted), _SQL_BATCH):
+            batch = wanted[start:start + _SQL_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, value FROM parsed WHERE key IN ({placeholders})", batch)
+            for key, value in rows:
+                found[key] = value
+        
+        if found:
+            now = time.time()
+            self._conn.executemany("UPDATE parsed SET last_used = ? WHERE key = ?",
+                                   [(now, key) for key in found])
+            self._conn.commit()
+        
+        results = []
+        for key in keys:
+            value = found.get(key)
+            if value is None:
+                self.misses += 1
+                results.append(None)
+            else:
+                self.hits += 1
+                results.append(pickle.loads(value))
+        return results
+    
+    def put(self, key: Optional[str], features: Dict) -> None:
+        """Store features under a key."""
+        self.put_many([(key, features)])
+    
+    def put_many(self, items: Sequence[Tuple[Optional[str], Dict]]) -> None:
+        """
+        Store several entries at once, then evict if over the size limit.
+        
+        Args:
+            items: (key, features) pairs; entries with a None key are skipped
+        """
+        now = time.time()
+        rows = []
+        for key, features in items:
+            if key is None:
+                continue
+            value = pickle.dumps(features, protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((key, value, len(value), now))
+        if not rows:
+            return
+        rows = list({row[0]: row for row in rows}.values())
+        
+        keys = [row[0] for row in rows]
+        for start in range(0, len(keys), _SQL_BATCH):
+            batch = keys[start:start + _SQL_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            self._total_bytes -= self._conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM parsed WHERE key IN ({placeholders})",
+                batch).fetchone()[0]
+        
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO parsed (key, value, size, last_used) VALUES (?, ?, ?, ?)", rows)
+        self._total_bytes += sum(row[2] for row in rows)
+        
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+        self._conn.commit()
+    
+    def _evict(self) -> None:
+        """Delete least recently used entries until usage is at most 90% of max_bytes."""
+        target = self.max_bytes * 0.9
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM parsed ORDER BY last_used"):
+            if self._total_bytes <= target:
+                break
+            doomed.append((key,))
+            self._total_bytes -= size
+        
+        self._conn.executemany("DELETE FROM parsed WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+    
+    def clear(self) -> None:
+        """Delete all entries."""
+        self._conn.execute("DELETE FROM parsed")
+        self._conn.commit()
+        self._total_bytes = 0
+    
+    def stats(self) -> Dict:
+        """
+        Get cache counters.
+        
+        Returns:
+            Dictionary with hits, misses, hit_rate, evictions, entries and bytes
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self),
+            'bytes': self._total_bytes
+        }
+    
+    def close(self) -> None:
+        """Close the cache file."""
+        self._conn.close()
@@ -0,0 +1,88 @@
+"""
+Sync State Storage
+
+This module persists how far each mail source has been ingested (the last
+IMAP UID, mbox offset or Maildir modification time), so re-running the
+collection pipeline only parses messages that arrived since the last run.
+"""
+
+import json
+import os
+import tempfile
+from typing import Dict, List, Optional
+
+
+SYNC_STATE_VERSION = 1
+
+DEFAULT_SYNC_STATE_FILENAME = "sync_state.json"
+
+
+def mailbox_source_id(path: str) -> str:
+    """Identify an mbox file or Maildir directory by its absolute path."""
+    return os.path.abspath(path)
+
+
+def imap_source_id(host: str, username: str, mailbox: str, port: int = 993) -> str:
+    """Identify an IMAP mailbox by account and mailbox name."""
+    return f"imap://{username}@{host}:{port}/{mailbox}"
+
+
+class SyncStateStore:
+    """JSON file mapping source ids to their sync positions."""
+    
+    def __init__(self, path: str):
+        """
+        Initialize the store, loading existing state if the file exists.
+        
+        Args:
+            path: Path to the JSON state file
+        """
+        self.path = path
+        self._sources: Dict[str, Dict] = {}
+        
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != SYNC_STATE_VERSION:
+                raise ValueError(f"Unsupported sync state version in {path}: {data.get('version')}")
+            self._sources = data['sources']
+    
+    def get(self, source: str) -> Optional[Dict]:
+        """Get the saved position of a source, or None if it was never synced."""
+        state = self._sources.get(source)
+        return dict(state) if state is not None else None
+    
+    def set(self, source: str, state: Dict) -> None:
+        """Record the position of a source (call save() to persist it)."""
+        self._sources[source] = dict(state)
+    
+    def remove(self, source: str) -> None:
+        """Forget a source, so its next sync starts from scratch."""
+        self._sources.pop(source, None)
+    
+    def sources(self) -> List[str]:
+        """List the ids of all tracked sources."""
+        return sorted(self._sources)
+    
+    def save(self) -> None:
+        """
+        Write the state file atomically.
+        
+        The new content goes to a temporary file in the same directory that
+        then replaces the old one, so a crash never leaves a truncated file.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.sync_state.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': SYNC_STATE_VERSION, 'sources': self._sources},
+                          f, indent=2, sort_keys=True)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
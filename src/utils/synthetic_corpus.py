@@ -0,0 +1,377 @@
+"""
+Synthetic Corpus Generator
+
+This module generates large, realistic mailboxes for load testing and
+capacity planning. Messages are derived from the labelled examples of
+src.utils.data_collector.SAMPLE_EMAILS and varied per label: multipart
+alternatives with HTML, attachments, mailing-list and reply headers,
+encoded display names, time zones and body lengths.
+
+Every message is generated from its own seed-derived random source, so
+message N is identical across runs for the same seed, and a corpus can be
+written in slices or extended later. Messages are written straight to an
+mbox file, so millions of them need no more memory than one message.
+
+Run from the project root:
+    python -m src.utils.synthetic_corpus --count 1000000 --output data/synthetic.mbox
+"""
+
+import argparse
+import base64
+import os
+import random
+import re
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.utils.data_collector import SAMPLE_EMAILS
+
+
+# Header carrying the ground-truth label, as in Gmail Takeout exports
+LABEL_HEADER = 'X-Gmail-Labels'
+
+DEFAULT_LABEL_WEIGHTS = {
+    'work': 0.30, 'newsletter': 0.20, 'spam': 0.15,
+    'shopping': 0.15, 'billing': 0.10, 'security': 0.10,
+}
+
+FIRST_NAMES = ['Alice', 'Bob', 'Carol', 'David', 'Erin', 'Frank', 'Grace', 'Heidi', 'Ivan',
+               'Judy', 'Mallory', 'Niaj', 'Olivia', 'Peggy', 'Rupert', 'Sybil', 'Trent',
+               'Victor', 'Walter', 'José', 'Zoë', 'Søren', 'Chloé', 'Łukasz']
+LAST_NAMES = ['Smith', 'Johnson', 'Lee', 'Brown', 'García', 'Müller', 'Rossi', 'Dubois',
+              'Kowalski', 'Tanaka', 'Nguyen', 'Patel', 'Andersen', 'O\'Brien']
+TIMEZONES = ['+0000', '-0500', '-0800', '+0100', '+0200', '+0530', '+0900', '-0300']
+MAILERS = ['Microsoft Outlook 16.0', 'Apple Mail (2.3731)', 'Mozilla Thunderbird 115.6',
+           'Gmail', 'SendGrid', 'Mailchimp Mailer', 'PHPMailer 6.8']
+TOPICS = ['budget', 'roadmap', 'hiring', 'Q1 planning', 'release', 'migration', 'design review',
+          'onboarding', 'customer escalation', 'security audit', 'offsite', 'OKRs']
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+# Per-label variation on top of the sample emails:
+# domains, sender mailboxes, extra subjects, body sentences, chance of an
+# HTML alternative, chance and kinds of attachments
+LABEL_STYLES: Dict[str, Dict] = {
+    'work': {
+        'domains': ['company.com', 'corp.example.com', 'partner.io'],
+        'mailboxes': None,
+        'subjects': ['Re: {topic} sync', 'Agenda for {weekday} {topic} review',
+                     '{topic} status update', 'Fwd: notes from the {topic} meeting'],
+        'sentences': ['Can we move the {topic} review to {weekday}?',
+                      'I have attached the latest numbers for the {topic} discussion.',
+                      'Please add your comments to the document before the meeting.',
+                      'The team agreed to revisit the {topic} timeline next sprint.',
+                      'Let me know if you have any questions.'],
+        'html': 0.2, 'attachment': 0.3,
+        'attachment_types': [('application/pdf', 'pdf'), ('application/vnd.openxmlformats-'
+                             'officedocument.spreadsheetml.sheet', 'xlsx'),
+                             ('application/vnd.openxmlformats-officedocument.'
+                              'wordprocessingml.document', 'docx')],
+    },
+    'newsletter': {
+        'domains': ['tech.com', 'ai.org', 'news.example.org', 'digest.example.net'],
+        'mailboxes': ['newsletter', 'digest', 'news', 'research', 'updates'],
+        'subjects': ['Weekly Newsletter #{number}', 'Monthly digest - {topic}',
+                     'This week in {topic}', 'Your {weekday} briefing'],
+        'sentences': ['Here are the top stories you might have missed this week.',
+                      'Read the full article on our website.',
+                      'Our editors picked five must-read pieces about {topic}.',
+                      'You are receiving this email because you subscribed to our newsletter.'],
+        'html': 1.0, 'attachment': 0.0, 'attachment_types': [],
+    },
+    'billing': {
+        'domains': ['service.com', 'billing.example.com', 'utility.example.net'],
+        'mailboxes': ['billing', 'invoices', 'accounts', 'no-reply'],
+        'subjects': ['Your invoice #{number} is ready', 'Payment received - thank you',
+                     'Statement for {month} available', 'Reminder: invoice #{number} due soon'],
+        'sentences': ['The amount due is ${amount}.', 'Payment is due within 30 days.',
+                      'You can view your invoice in your account dashboard.',
+                      'Thank you for your business.'],
+        'html': 0.5, 'attachment': 0.7,
+        'attachment_types': [('application/pdf', 'pdf')],
+    },
+    'spam': {
+        'domains': ['fake.com', 'win-big.example.biz', 'lucky-draw.example.info'],
+        'mailboxes': ['winner', 'promo', 'claims', 'offers'],
+        'subjects': ['You won a prize!', 'URGENT: claim your ${amount} reward!!!',
+                     'Congratulations {first}!', 'Limited time offer - {number}% off'],
+        'sentences': ['Click here to claim your prize now!', 'This offer expires in 24 hours!!!',
+                      'You have been selected as our lucky winner.',
+                      'Send us your bank details to receive ${amount}.'],
+        'html': 0.9, 'attachment': 0.05,
+        'attachment_types': [('application/zip', 'zip')],
+    },
+    'shopping': {
+        'domains': ['shop.com', 'store.example.com', 'market.example.net'],
+        'mailboxes': ['orders', 'shipping', 'no-reply', 'support'],
+        'subjects': ['Your order #{number} has shipped', 'Order confirmation #{number}',
+                     'Your package is out for delivery', 'Items in your cart are waiting'],
+        'sentences': ['Your order #{number} will arrive in 3-5 business days.',
+                      'Track your package with the link below.',
+                      'Order total: ${amount}.', 'Thank you for shopping with us.'],
+        'html': 0.9, 'attachment': 0.1,
+        'attachment_types': [('image/png', 'png')],
+    },
+    'security': {
+        'domains': ['bank.com', 'accounts.example.com', 'id.example.org'],
+        'mailboxes': ['security', 'alerts', 'no-reply'],
+        'subjects': ['Security alert - new login', 'Your password was changed',
+                     'New sign-in from {first}\'s device', 'Verify your account activity'],
+        'sentences': ['We detected a new login to your account.',
+                      'If this was you, no action is needed.',
+                      'If this was not you, please reset your password immediately.',
+                      'Location: approximately {number} km from your usual sign-in.'],
+        'html': 0.4, 'attachment': 0.0, 'attachment_types': [],
+    },
+}
+
+_FROM_LINE_RE = re.compile(r'^(>*From )', re.MULTILINE)
+
+
+class SyntheticCorpusGenerator:
+    """Deterministic generator of labelled RFC822 messages."""
+    
+    def __init__(self, seed: int = 0, label_weights: Optional[Dict[str, float]] = None,
+                 attachment_kb: Tuple[int, int] = (2, 64), body_sentences: Tuple[int, int] = (2, 40),
+                 start_date: datetime = datetime(2023, 1, 1, tzinfo=timezone.utc), days: int = 730):
+        """
+        Initialize the generator.
+        
+        Args:
+            seed: Corpus seed; the same seed gives the same messages
+            label_weights: Relative frequency of each label (defaults to
+                DEFAULT_LABEL_WEIGHTS); labels must appear in LABEL_STYLES
+            attachment_kb: Range of attachment sizes in KB
+            body_sentences: Range of extra body sentences per message
+            start_date: Earliest message date
+            days: Number of days over which message dates are spread
+        """
+        label_weights = label_weights or DEFAULT_LABEL_WEIGHTS
+        unknown = set(label_weights) - set(LABEL_STYLES)
+        if unknown:
+            raise ValueError(f"No message style for labels: {sorted(unknown)}")
+        
+        self.seed = seed
+        self.labels = list(label_weights)
+        self.weights = [label_weights[label] for label in self.labels]
+        self.attachment_kb = attachment_kb
+        self.body_sentences = body_sentences
+        self.start_date = start_date
+        self.days = days
+        
+        self.samples: Dict[str, List[Dict]] = {label: [] for label in LABEL_STYLES}
+        for record in SAMPLE_EMAILS:
+            self.samples[record['filter_label']].append(record)
+    
+    def message(self, index: int) -> Tuple[str, str]:
+        """
+        Generate one message.
+        
+        Args:
+            index: Message number
+        
+        Returns:
+            Tuple of (label, raw RFC822 message)
+        """
+        rng = random.Random(f"{self.seed}:{index}")
+        label = rng.choices(self.labels, self.weights)[0]
+        style = LABEL_STYLES[label]
+        sample = rng.choice(self.samples[label]) if self.samples[label] else None
+        
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        values = {
+            'topic': rng.choice(TOPICS), 'weekday': rng.choice(WEEKDAYS),
+            'month': rng.choice(MONTHS), 'first': first,
+            'number': rng.randint(1000, 99999), 'amount': f"{rng.uniform(5, 5000):,.2f}",
+        }
+        
+        domain = rng.choice(style['domains'])
+        if sample is not None and rng.random() < 0.3:
+            subject = sample['subject']
+            local = sample['sender'].split('@', 1)[0]
+            domain = sample['sender'].split('@', 1)[1]
+        else:
+            subject = rng.choice(style['subjects']).format(**values)
+            if style['mailboxes']:
+                local = rng.choice(style['mailboxes'])
+            else:
+                local = f"{first}.{last}".lower().encode('ascii', 'ignore').decode('ascii')
+                local = re.sub(r'[^a-z.]', '', local) or 'user'
+        
+        sentences = [sample['content']] if sample is not None else []
+        sentences += [rng.choice(style['sentences']).format(**values)
+                      for _ in range(rng.randint(*self.body_sentences))]
+        if label == 'work' and rng.random() < 0.4:
+            sentences.append('\n'.join('> ' + line for line in
+                                       rng.sample(style['sentences'], 2)).format(**values))
+        sentences.append(f"--\n{first} {last}")
+        text = '\n\n'.join(sentences) + '\n'
+        
+        date = self.start_date + timedelta(seconds=rng.randrange(self.days * 86400))
+        headers = [
+            ('Message-ID', f"<{index}.{rng.getrandbits(48):012x}@{domain}>"),
+            ('Date', _format_date(date, rng.choice(TIMEZONES))),
+            ('From', f"{_display_name(f'{first} {last}')} <{local}@{domain}>"),
+            ('To', ', '.join(_recipients(rng, rng.randint(1, 4) if label == 'work' else 1))),
+            ('Subject', _encode_header(subject)),
+            ('X-Mailer', rng.choice(MAILERS)),
+            (LABEL_HEADER, label),
+        ]
+        if label == 'work' and rng.random() < 0.5:
+            headers.append(('Cc', ', '.join(_recipients(rng, rng.randint(1, 3)))))
+        if label == 'newsletter':
+            headers += [('List-Id', f"<{local}.{domain}>"),
+                        ('List-Unsubscribe', f"<https://{domain}/unsubscribe?id={index}>"),
+                        ('Precedence', 'bulk')]
+        if label == 'spam':
+            headers.append(('Reply-To', f"claims{rng.randint(1, 999)}@{rng.choice(LABEL_STYLES['spam']['domains'])}"))
+        
+        body_parts = [_text_part('plain', text)]
+        if rng.random() < style['html']:
+            html = ''.join(f"<p>{sentence.replace(chr(10), '<br>')}</p>" for sentence in sentences)
+            html_part = _text_part('html', f"<html><head><style>p {{ margin: 0 }}</style></head>"
+                                           f"<body>{html}</body></html>\n")
+            # Spam often comes as HTML only
+            body_parts = [html_part] if label == 'spam' and rng.random() < 0.6 else body_parts + [html_part]
+        
+        attachments = []
+        if style['attachment_types'] and rng.random() < style['attachment']:
+            for number in range(rng.choice([1, 1, 1, 2, 3])):
+                content_type, extension = rng.choice(style['attachment_types'])
+                size = rng.randint(*self.attachment_kb) * 1024
+                filename = f"{label}_{values['number']}_{number}.{extension}"
+                attachments.append(_attachment_part(content_type, filename, rng.randbytes(size)))
+        
+        boundary = f"=_{self.seed}_{index}"
+        if len(body_parts) == 1 and not attachments:
+            body = body_parts[0]
+        elif not attachments:
+            body = _multipart('alternative', f"{boundary}_alt", body_parts)
+        else:
+            content = body_parts[0] if len(body_parts) == 1 else \
+                _multipart('alternative', f"{boundary}_alt", body_parts)
+            body = _multipart('mixed', f"{boundary}_mixed", [content] + attachments)
+        
+        header_block = ''.join(f"{name}: {value}\n" for name, value in headers)
+        return label, f"{header_block}MIME-Version: 1.0\n{body}"
+    
+    def messages(self, count: int, start: int = 0) -> Iterator[Tuple[str, str]]:
+        """
+        Generate a run of messages.
+        
+        Args:
+            count: Number of messages
+            start: Index of the first message
+        
+        Yields:
+            Tuples of (label, raw RFC822 message)
+        """
+        for index in range(start, start + count):
+            yield self.message(index)
+    
+    def write_mbox(self, path: str, count: int, start: int = 0, append: bool = False) -> Dict:
+        """
+        Stream messages to an mbox file.
+        
+        Body lines starting with "From " are quoted as ">From " so they are
+        not mistaken for envelope lines.
+        
+        Args:
+            path: Output mbox file
+            count: Number of messages
+            start: Index of the first message
+            append: Add to an existing file instead of replacing it
+        
+        Returns:
+            Dictionary with messages, bytes and per-label counts written
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        
+        labels = Counter()
+        written = 0
+        with open(path, 'ab' if append else 'wb', buffering=1024 * 1024) as f:
+            for index, (label, raw_email) in enumerate(self.messages(count, start), start=start):
+                if '\nFrom ' in raw_email or raw_email.startswith('From '):
+                    raw_email = _FROM_LINE_RE.sub(r'>\1', raw_email)
+                date = self.start_date + timedelta(days=index % self.days)
+                data = (f"From synthetic@example.com {date:%a %b %d %H:%M:%S %Y}\n"
+                        f"{raw_email.rstrip(chr(10))}\n\n").encode('utf-8')
+                f.write(data)
+                written += len(data)
+                labels[label] += 1
+        
+        return {'messages': count, 'bytes': written, 'labels': dict(labels)}
+
+
+def _format_date(date: datetime, offset: str) -> str:
+    """Format an RFC 5322 date in the given UTC offset."""
+    sign = -1 if offset[0] == '-' else 1
+    local = date + sign * timedelta(hours=int(offset[1:3]), minutes=int(offset[3:]))
+    return (f"{WEEKDAYS[local.weekday()]}, {local.day:02d} {MONTHS[local.month - 1]} "
+            f"{local.year} {local:%H:%M:%S} {offset}")
+
+
+def _encode_header(value: str) -> str:
+    """Encode a header value as an RFC 2047 word if it is not ASCII."""
+    if value.isascii():
+        return value
+    return f"=?utf-8?b?{base64.b64encode(value.encode('utf-8')).decode('ascii')}?="
+
+
+def _display_name(name: str) -> str:
+    """Quote or encode a display name for an address header."""
+    if not name.isascii():
+        return _encode_header(name)
+    return f'"{name}"' if "'" in name else name
+
+
+def _recipients(rng: random.Random, count: int) -> List[str]:
+    """Pick recipient addresses."""
+    return [f"{rng.choice(FIRST_NAMES).lower().encode('ascii', 'ignore').decode('ascii') or 'user'}"
+            f"{rng.randint(1, 99)}@{rng.choice(LABEL_STYLES['work']['domains'])}"
+            for _ in range(count)]
+
+
+def _text_part(subtype: str, text: str) -> str:
+    """Build a text part; non-ASCII text is sent as 8-bit UTF-8."""
+    encoding = '7bit' if text.isascii() else '8bit'
+    return (f"Content-Type: text/{subtype}; charset=\"utf-8\"\n"
+            f"Content-Transfer-Encoding: {encoding}\n\n{text}")
+
+
+def _attachment_part(content_type: str, filename: str, payload: bytes) -> str:
+    """Build a base64-encoded attachment part."""
+    return (f"Content-Type: {content_type}; name=\"{filename}\"\n"
+            f"Content-Disposition: attachment; filename=\"{filename}\"\n"
+            f"Content-Transfer-Encoding: base64\n\n"
+            f"{base64.encodebytes(payload).decode('ascii')}")
+
+
+def _multipart(subtype: str, boundary: str, parts: List[str]) -> str:
+    """Join parts into a multipart body with its Content-Type header."""
+    body = ''.join(f"--{boundary}\n{part.rstrip(chr(10))}\n" for part in parts)
+    return (f"Content-Type: multipart/{subtype}; boundary=\"{boundary}\"\n\n"
+            f"{body}--{boundary}--\n")
+
+
+def main():
+    parser_args = argparse.ArgumentParser(description="Generate a synthetic mbox corpus")
+    parser_args.add_argument('--count', type=int, default=100000)
+    parser_args.add_argument('--seed', type=int, default=0)
+    parser_args.add_argument('--start', type=int, default=0, help="Index of the first message")
+    parser_args.add_argument('--append', action='store_true')
+    parser_args.add_argument('--output', default='data/synthetic.mbox')
+    args = parser_args.parse_args()
+    
+    generator = SyntheticCorpusGenerator(seed=args.seed)
+    stats = generator.write_mbox(args.output, args.count, start=args.start, append=args.append)
+    
+    print(f"✅ Wrote {stats['messages']:,} messages ({stats['bytes'] / 1024 ** 2:,.1f} MB) to {args.output}")
+    for label, count in sorted(stats['labels'].items()):
+        print(f"   - {label}: {count:,}")
+
+
+if __name__ == "__main__":
+    main()